@@ -9,6 +9,7 @@ from ui.pages.search_page import search_page
 from ui.pages.details_page import details_page
 from ui.pages.save_page import save_page
 from ui.pages.compare_page import compare_page
+from src.data.game_table import get_game_table
 
 # Import functions from the similarity search app individually
 from src.analysis.similarity import (
@@ -81,6 +82,9 @@ def setup_similarity_sidebar() -> Tuple[str, int, float]:
         if 'mechanics_filter' not in st.session_state:
             st.session_state.mechanics_filter = []
         
+        if 'filter_match_all' not in st.session_state:
+            st.session_state.filter_match_all = False
+        
     return data_file, top_n, similarity_threshold
 
 # Custom CSS
@@ -178,16 +182,35 @@ def similarity_search_page():
     embeddings = data['embeddings']
     similarity_matrix = data['similarity_matrix']
     
+    # Recall / latency knob when an approximate nearest-neighbour index is loaded
+    n_probe = None
+    ann_index = getattr(similarity_matrix, 'ann_index', None)
+    if ann_index is not None:
+        n_probe = st.sidebar.slider(
+            t("similarity.ann_probes"),
+            min_value=1,
+            max_value=ann_index.n_lists,
+            value=ann_index.default_n_probe,
+            help=t("similarity.ann_probes_help")
+        )
+    
     st.success(t("loading.games_loaded", count=len(games)))
     
-    # Extract list of categories and mechanics
-    categories, mechanics = extract_categories_and_mechanics(game_data_list)
+    # Filter choices come from the whole catalogue (cached, rebuilt when a game file changes)
+    catalog_table = get_game_table()
+    categories, mechanics = extract_categories_and_mechanics(
+        game_data_list, catalog_table if len(catalog_table) else data.get('game_table')
+    )
     
     # Filter settings
     selected_categories, selected_mechanics = display_filter_ui(categories, mechanics)
     
     # Filtering
-    filtered_indices = filter_games(games, game_data_list, selected_categories, selected_mechanics)
+    filtered_indices = filter_games(
+        games, game_data_list, selected_categories, selected_mechanics,
+        match_all=st.session_state.filter_match_all,
+        game_table=data.get('game_table')
+    )
     if not filtered_indices:
         st.warning(t("similarity.no_matching_games"))
         return
@@ -228,14 +251,16 @@ def similarity_search_page():
         
         with tab1:
             # Get similar game indices
-            similar_indices = get_similar_indices(selected_index, similarity_matrix, top_n, similarity_threshold)
+            similar_indices, similarities = get_similar_indices(
+                selected_index, similarity_matrix, top_n, similarity_threshold,
+                n_probe=n_probe, return_scores=True
+            )
             
             if not similar_indices.size:
                 st.warning(t("similarity.no_similar_games", threshold=similarity_threshold))
             else:
                 # Display each similar game
-                for rank, idx in enumerate(similar_indices, 1):
-                    similarity = similarity_matrix[selected_index][idx]
+                for idx, similarity in zip(similar_indices, similarities):
                     
                     # Display similarity score
                     st.markdown(f"<div class='similarity-score'>{t('similarity.similarity_score', score=f'{similarity:.4f}')}</div>", unsafe_allow_html=True)
@@ -270,7 +295,8 @@ def similarity_search_page():
             try:
                 # Plot similarity to selected game with others
                 df, category_counts, mechanics_counts = analyze_distribution_data(
-                    selected_index, games, game_data_list, similarity_matrix
+                    selected_index, games, game_data_list, similarity_matrix,
+                    game_table=data.get('game_table')
                 )
                 
                 st.markdown(f"### {t('similarity.analysis.top_games')}")
@@ -0,0 +1,115 @@
+"""
+Benchmark: IVF approximate nearest-neighbour search vs. exact similarity rows.
+
+Builds an IVFIndex over synthetic embeddings (clustered Gaussian vectors, or
+local-hash embeddings of generated game texts) at several catalogue sizes and
+reports, for the exact search the similarity page uses without an index and
+for the index at several n_probe values:
+
+- recall@k: share of the exact top-k games the search returns
+- p50 / p99: per-query latency in milliseconds
+
+Usage:
+    python benchmarks/bench_ann.py [--sizes 10000 50000 100000] [--dim 256]
+                                   [--queries 200] [--source synthetic|local-hash] [--spread 1.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.analysis.embedding_index import IVFIndex, SimilarityView, normalize_embeddings  # noqa: E402
+
+# Words the local-hash game texts are drawn from (mechanic / category style vocabulary)
+_WORDS = (
+    "worker placement deck building hand management area control dice rolling tile placement "
+    "set collection engine building cooperative negotiation bluffing trading auction bidding "
+    "drafting route building network pick up deliver push your luck hidden roles economic "
+    "fantasy science fiction medieval war farming civilization exploration trains racing "
+    "abstract party family strategy card game city building space adventure horror puzzle"
+).split()
+
+def synthetic_embeddings(n, dim, spread=1.0, seed=0):
+    """Clustered Gaussian vectors (about 50 games per cluster, like genres of related games)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, n // 50), dim)).astype(np.float32)
+    assignment = rng.integers(0, len(centers), size=n)
+    return centers[assignment] + spread * rng.normal(size=(n, dim)).astype(np.float32)
+
+def local_hash_embeddings(n, dim, spread=None, seed=0):
+    """local-hash embeddings of generated game texts (offline, see generate_embedding_model)"""
+    from generate_embedding_model import LocalHashEmbeddingProvider
+
+    rng = np.random.default_rng(seed)
+    themes = rng.integers(0, len(_WORDS), size=(max(1, n // 50), 12))
+    texts = []
+    for theme in themes[rng.integers(0, len(themes), size=n)]:
+        words = [_WORDS[i] for i in theme[rng.random(len(theme)) < 0.7]]
+        words += [_WORDS[i] for i in rng.integers(0, len(_WORDS), size=4)]
+        texts.append(" ".join(words))
+    return LocalHashEmbeddingProvider(dimension=dim).embed_array(texts)
+
+def exact_top_k(embeddings, index, k):
+    """Exact top-k by one similarity row (what the similarity page does without an index)"""
+    scores = embeddings @ embeddings[index]
+    scores[index] = -np.inf
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+def timed(func, queries):
+    """Results of func(query) for each query and the per-query latencies in seconds"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(func(query))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies)
+
+def report(label, latencies, recall=None):
+    p50, p99 = np.percentile(latencies * 1000, [50, 99])
+    recall_text = "exact" if recall is None else f"{recall:.3f}"
+    print(f"  {label:<16} recall {recall_text:>6}   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall and latency of the IVF index vs exact search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000],
+                        help="Catalogue sizes (default: 10000 50000 100000)")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension (default: 256)")
+    parser.add_argument("--queries", type=int, default=200, help="Query games per size (default: 200)")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query (default: 10)")
+    parser.add_argument("--source", choices=["synthetic", "local-hash"], default="synthetic",
+                        help="Embeddings to index (default: synthetic)")
+    parser.add_argument("--spread", type=float, default=1.0,
+                        help="Synthetic noise around the cluster centres; higher overlaps more (default: 1.0)")
+    args = parser.parse_args()
+
+    make_embeddings = synthetic_embeddings if args.source == "synthetic" else local_hash_embeddings
+    for n in args.sizes:
+        embeddings = normalize_embeddings(make_embeddings(n, args.dim, args.spread))
+        start = time.perf_counter()
+        index = IVFIndex.build(embeddings)
+        build_time = time.perf_counter() - start
+        view = SimilarityView(embeddings, ann_index=index)
+        queries = np.random.default_rng(1).choice(n, size=min(args.queries, n), replace=False)
+
+        print(f"{n} games, dim {args.dim}, {index.n_lists} lists (built in {build_time:.1f} s)")
+        exact, latencies = timed(lambda query: exact_top_k(embeddings, query, args.k), queries)
+        report("exact", latencies)
+
+        default = index.default_n_probe
+        for n_probe in sorted({1, max(1, default // 2), default, min(index.n_lists, default * 2)}):
+            found, latencies = timed(lambda query: view.search(query, args.k, n_probe=n_probe)[0], queries)
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(found, exact)])
+            label = f"n_probe {n_probe}" + (" *" if n_probe == default else "")
+            report(label, latencies, recall)
+
+    print("* default n_probe (slider start value on the similarity page)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: streaming thing parser vs. the previous findall-based parser.
+
+Parses the saved thing responses in tests/fixtures/bgg/ with
+src.api.bgg_parser.parse_thing_items (single iterparse pass) and with the
+ElementTree + ``.//`` descendant search parser it replaced, checks that both
+return the same dicts, and reports the median parse time and the tracemalloc
+peak of each.
+
+Usage:
+    python benchmarks/bench_bgg_parser.py [--repeat 200] [--multiply 1]
+
+--multiply concatenates the items of each response N times to simulate
+larger documents.
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.api.bgg_parser import parse_thing_items  # noqa: E402
+
+FIXTURES = os.path.join(ROOT_DIR, "tests", "fixtures", "bgg", "thing_*.xml")
+
+def _links(item, link_type):
+    return [
+        {"id": link.get("id"), "name": link.get("value")}
+        for link in item.findall(f".//link[@type='{link_type}']")
+    ]
+
+def _sorted_counts(counts):
+    try:
+        return sorted(counts, key=lambda x: float(x.replace("+", "")))
+    except ValueError:
+        return counts
+
+def findall_parse_item(item):
+    """Reference copy of the parser used before the streaming rewrite"""
+    game = {"id": item.get("id"), "type": item.get("type")}
+
+    name_element = item.find(".//name[@type='primary']")
+    if name_element is not None:
+        game["name"] = name_element.get("value")
+
+    alternate_names = []
+    for name_elem in item.findall(".//name"):
+        if name_elem.get("type") == "primary":
+            continue
+        alternate_names.append(name_elem.get("value"))
+        if name_elem.get("language") in ("ja", "jp", "jpn"):
+            game["japanese_name"] = name_elem.get("value")
+    if alternate_names:
+        game["alternate_names"] = alternate_names
+        if "japanese_name" not in game:
+            for alt_name in alternate_names:
+                if any('\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF' for c in alt_name):
+                    game["japanese_name"] = alt_name
+                    break
+
+    year_element = item.find(".//yearpublished")
+    if year_element is not None:
+        game["year_published"] = year_element.get("value")
+    thumbnail_element = item.find(".//thumbnail")
+    if thumbnail_element is not None and thumbnail_element.text:
+        game["thumbnail_url"] = thumbnail_element.text
+    for tag, key in (("minplayers", "publisher_min_players"), ("maxplayers", "publisher_max_players"),
+                     ("playingtime", "playing_time"), ("minage", "publisher_min_age")):
+        element = item.find(f".//{tag}")
+        if element is not None:
+            game[key] = element.get("value")
+
+    community_players = {"Best": [], "Recommended": [], "Not Recommended": []}
+    for numplayer_result in item.findall(".//poll[@name='suggested_numplayers']/results"):
+        best_votes = 0
+        best_recommendation = "not_recommended"
+        for result in numplayer_result.findall("./result"):
+            vote_count = int(result.get("numvotes", "0"))
+            if vote_count > best_votes:
+                best_votes = vote_count
+                best_recommendation = result.get("value")
+        if best_recommendation in community_players:
+            community_players[best_recommendation].append(numplayer_result.get("numplayers"))
+    if community_players["Best"]:
+        game["community_best_players"] = ", ".join(_sorted_counts(community_players["Best"]))
+    if community_players["Recommended"]:
+        game["community_recommended_players"] = ", ".join(_sorted_counts(community_players["Recommended"]))
+
+    suggested_age_poll = item.find(".//poll[@name='suggested_playerage']")
+    if suggested_age_poll is not None:
+        best_age_votes = 0
+        community_age = None
+        for age_result in suggested_age_poll.findall("./results/result"):
+            vote_count = int(age_result.get("numvotes", "0"))
+            if vote_count > best_age_votes:
+                best_age_votes = vote_count
+                community_age = age_result.get("value")
+        if community_age:
+            game["community_min_age"] = community_age
+
+    description_element = item.find(".//description")
+    if description_element is not None and description_element.text:
+        game["description"] = description_element.text
+
+    game["mechanics"] = _links(item, "boardgamemechanic")
+    game["categories"] = _links(item, "boardgamecategory")
+    game["designers"] = _links(item, "boardgamedesigner")
+    game["publishers"] = _links(item, "boardgamepublisher")
+
+    ratings = item.find(".//ratings")
+    if ratings is not None:
+        avg_rating = ratings.find(".//average")
+        if avg_rating is not None:
+            game["average_rating"] = avg_rating.get("value")
+        weight_element = ratings.find(".//averageweight")
+        if weight_element is not None:
+            game["weight"] = weight_element.get("value")
+        game["ranks"] = [
+            {"type": rank.get("name"), "id": rank.get("id"), "rank": rank.get("value")}
+            for rank in ratings.findall(".//rank") if rank.get("value") != "Not Ranked"
+        ]
+    return game
+
+def findall_parse_thing_items(content):
+    """Full-tree parse followed by descendant searches per item"""
+    return [findall_parse_item(item) for item in ET.fromstring(content).findall("item")]
+
+def _multiply(content, factor):
+    """Repeat the items of a thing response factor times"""
+    if factor <= 1:
+        return content
+    start = content.index(b"<item ")
+    end = content.rindex(b"</items>")
+    return content[:start] + content[start:end] * factor + content[end:]
+
+def measure(parse, content, repeat):
+    """Median seconds per parse and tracemalloc peak bytes of one parse"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BGG thing parsers on saved responses")
+    parser.add_argument("--repeat", type=int, default=200, help="Parses per measurement (default: 200)")
+    parser.add_argument("--multiply", type=int, default=1, help="Repeat the items of each response N times")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(FIXTURES))
+    if not paths:
+        sys.exit(f"No saved responses found at {FIXTURES}")
+
+    print(f"{'response':<24} {'items':>6} {'KB':>7} {'findall ms':>11} {'stream ms':>10} "
+          f"{'findall peak KB':>16} {'stream peak KB':>15}")
+    for path in paths:
+        with open(path, "rb") as file:
+            content = _multiply(file.read(), args.multiply)
+        expected = findall_parse_thing_items(content)
+        if parse_thing_items(content) != expected:
+            sys.exit(f"{os.path.basename(path)}: parsers disagree")
+
+        old_time, old_peak = measure(findall_parse_thing_items, content, args.repeat)
+        new_time, new_peak = measure(parse_thing_items, content, args.repeat)
+        print(f"{os.path.basename(path):<24} {len(expected):>6} {len(content) / 1024:>7.1f} "
+              f"{old_time * 1000:>11.2f} {new_time * 1000:>10.2f} "
+              f"{old_peak / 1024:>16.0f} {new_peak / 1024:>15.0f}")
+
+if __name__ == "__main__":
+    main()
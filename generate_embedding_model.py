@@ -1,4 +1,3 @@
-import yaml
 import numpy as np
 import os
 import glob
@@ -7,12 +6,24 @@ import voyageai
 from sklearn.metrics.pairwise import cosine_similarity
 import argparse
 from tqdm import tqdm
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
 from dotenv import load_dotenv
 import hashlib
+import re
 import time
 import random
+from abc import ABC, abstractmethod
+from collections import deque
+from src.data.yaml_io import load_yaml, iter_game_files
+from src.analysis.embedding_cache import DEFAULT_EMBEDDING_CACHE_PATH, EmbeddingCache
+from src.api.rate_limiter import RateLimiter
+from src.analysis.embedding_index import (
+    ANN_INDEX_TYPES,
+    ANN_MIN_GAMES,
+    DENSE_MATRIX_MAX_GAMES,
+    normalize_embeddings,
+)
 
 # Load environment variables
 load_dotenv()
@@ -21,7 +32,8 @@ def parse_args() -> argparse.Namespace:
     """Function to parse command line arguments"""
     parser = argparse.ArgumentParser(description='Calculate and save embeddings for board game data')
     parser.add_argument('--model', default='voyage-4-large',
-                      help='Embedding model name (default: voyage-4-large)')
+                      help='Embedding model name (default: voyage-4-large); '
+                           'local-hash computes deterministic embeddings offline without an API key')
     parser.add_argument('--data_path', default='game_data/*.yaml', 
                       help='Game data path (glob format)')
     parser.add_argument('--output', default='game_embeddings.pkl', 
@@ -31,21 +43,43 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--max_retries', type=int, default=5,
                       help='Number of retries on API request failure (default: 5)')
     parser.add_argument('--request_interval', type=float, default=0.5,
-                      help='Wait time between requests (seconds, default: 0.5)')
+                      help='Minimum time between the starts of two requests (seconds, default: 0.5)')
+    parser.add_argument('--max_concurrency', type=int, default=4,
+                      help='Number of API requests in flight (default: 4)')
+    parser.add_argument('--max_tokens_per_minute', type=int, default=3000000,
+                      help='Estimated tokens sent per minute at most (default: 3000000, 0=no limit)')
     parser.add_argument('--timeout', type=int, default=15,
                       help='API request timeout (seconds, default: 15)')
     parser.add_argument('--limit', type=int, default=0,
                       help='Maximum number of files to process (0=process all)')
     parser.add_argument('--skip', type=int, default=0,
                       help='Number of files to skip processing')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Worker processes for loading YAML files (default: one per CPU, 1=no parallelism)')
     parser.add_argument('--resume', action='store_true',
                       help='Resume previous processing from where it stopped (if intermediate files exist)')
     parser.add_argument('--force', action='store_true',
                       help='Force processing even if YAML files have not changed')
+    parser.add_argument('--incremental', action='store_true',
+                      help='Reuse embeddings of games whose text is unchanged since the previous output '
+                           '(same model); only new or changed games are sent to the API')
+    parser.add_argument('--embedding_cache', default=DEFAULT_EMBEDDING_CACHE_PATH,
+                      help=f'SQLite store of embeddings by model and text hash, checked before calling the API '
+                           f'(default: {DEFAULT_EMBEDDING_CACHE_PATH})')
+    parser.add_argument('--no_embedding_cache', action='store_true',
+                      help='Do not read or write the embedding cache')
     parser.add_argument('--max_tokens_per_item', type=int, default=3000,
                       help='Maximum tokens per item (default: 3000)')
     parser.add_argument('--max_tokens_per_batch', type=int, default=100000,
                       help='Maximum tokens per batch (default: 100000)')
+    parser.add_argument('--dense_matrix_max_games', type=int, default=DENSE_MATRIX_MAX_GAMES,
+                      help=f'Also store the dense N×N similarity matrix up to this many games; '
+                           f'larger catalogues store only normalized embeddings (default: {DENSE_MATRIX_MAX_GAMES}, 0=never)')
+    parser.add_argument('--ann_index', choices=['auto', 'none'] + sorted(ANN_INDEX_TYPES), default='auto',
+                      help=f'Approximate nearest-neighbour index to store with the embeddings '
+                           f'(default: auto = ivf above {ANN_MIN_GAMES} games)')
+    parser.add_argument('--ann_lists', type=int, default=None,
+                      help='Number of IVF lists (default: square root of the game count)')
     parser.add_argument('--api_key', 
                       help='Voyage AI API key (direct specification instead of .env file)')
     return parser.parse_args()
@@ -54,7 +88,7 @@ def load_game_data(file_path: str) -> Dict[str, Any]:
     """Function to load game data from YAML file"""
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+            return load_yaml(file)
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
         return {}
@@ -328,8 +362,125 @@ def check_files_changed(new_metadata: Dict[str, str], old_metadata: Dict[str, st
     
     return False
 
+# Dimension of the local-hash embeddings (same as voyage-4-large, so benchmarks see realistic sizes)
+LOCAL_HASH_DIMENSION = 1024
+
+# Memoized token -> feature entries kept by LocalHashEmbeddingProvider before the memo is reset
+_FEATURE_MEMO_SIZE = 1_000_000
+
+# Kana, CJK ideographs (with 々) and halfwidth katakana: scripts written without spaces
+_CJK_CHARS = "\u3005\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f"
+
+_CJK_PATTERN = re.compile(f"[{_CJK_CHARS}]")
+
+# Words, with runs of _CJK_CHARS split off as separate tokens
+_TOKEN_PATTERN = re.compile(f"[{_CJK_CHARS}]+|[^\\W{_CJK_CHARS}]+")
+
+class EmbeddingProvider(ABC):
+    """Interface of the embedding backends used by get_embeddings"""
+
+    # Remote providers are rate limited and their results kept in the embedding cache
+    remote = True
+
+    @abstractmethod
+    async def embed(self, texts: List[str], model: str) -> List[List[float]]:
+        """Function to embed one batch of texts (one vector per text, in order)"""
+
+class VoyageEmbeddingProvider(EmbeddingProvider):
+    """Voyage AI embedding API"""
+
+    def __init__(self, api_key: str = None, max_retries: int = 5, timeout: int = 15):
+        # Get API key from environment variable
+        if api_key is None:
+            api_key = os.getenv("VOYAGE_API_KEY")
+        
+        if not api_key:
+            print("VOYAGE_API_KEY is not set")
+            raise ValueError("API key is not set")
+        
+        self.client = voyageai.AsyncClient(api_key=api_key, max_retries=max_retries, timeout=timeout)
+
+    async def embed(self, texts: List[str], model: str) -> List[List[float]]:
+        response = await self.client.embed(texts, model=model)
+        
+        # Handle new API response format
+        if hasattr(response, 'embeddings'):
+            return response.embeddings
+        else:
+            # Old response format (just in case)
+            return [item for item in response]
+
+class LocalHashEmbeddingProvider(EmbeddingProvider):
+    """Deterministic offline embeddings (--model local-hash)
+    
+    Signed feature hashing of the word and word-bigram counts of a text (CJK
+    runs as character bigrams) into a fixed number of dimensions, with
+    sublinear term frequency and L2 normalization. Needs no API key or
+    network, so the pipeline and the similarity page can be run in CI,
+    air-gapped environments and benchmarks. Similarity reflects shared
+    wording only, not meaning. There is no IDF weighting: a vector depends
+    on its own text alone, like an API embedding.
+    """
+
+    remote = False
+
+    def __init__(self, dimension: int = LOCAL_HASH_DIMENSION):
+        self.dimension = dimension
+        self._features = {}
+
+    def _feature(self, token: str) -> int:
+        """Signed feature of a token: bucket + 1, negated for half of the tokens"""
+        feature = self._features.get(token)
+        if feature is None:
+            digest = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+            feature = (digest % self.dimension) + 1
+            if digest >> 63:
+                feature = -feature
+            if len(self._features) >= _FEATURE_MEMO_SIZE:
+                self._features.clear()
+            self._features[token] = feature
+        return feature
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Function to split a text into the hashed tokens (words and adjacent word pairs)"""
+        words = []
+        for word in _TOKEN_PATTERN.findall(text.lower()):
+            if len(word) > 2 and _CJK_PATTERN.match(word):
+                # Scripts without spaces (Japanese, Chinese) form long runs: use character bigrams
+                words.extend(word[i:i + 2] for i in range(len(word) - 1))
+            else:
+                words.append(word)
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Function to embed texts into an L2-normalized float32 array (len(texts)×dimension)"""
+        features = [np.array([self._feature(token) for token in self.tokenize(text)], dtype=np.int64)
+                    for text in texts]
+        lengths = np.array([len(row) for row in features], dtype=np.int64)
+        features = np.concatenate(features) if features else np.empty(0, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        counts = np.bincount(
+            rows * self.dimension + np.abs(features) - 1,
+            weights=np.sign(features).astype(np.float64),
+            minlength=len(texts) * self.dimension
+        ).reshape(len(texts), self.dimension)
+        return normalize_embeddings(np.sign(counts) * np.log1p(np.abs(counts)))
+
+    async def embed(self, texts: List[str], model: str) -> List[List[float]]:
+        return list(self.embed_array(texts))
+
+# Models computed locally instead of by the Voyage AI API (--model)
+LOCAL_EMBEDDING_PROVIDERS = {'local-hash': LocalHashEmbeddingProvider}
+
+def get_embedding_provider(model: str, api_key: str = None, max_retries: int = 5, timeout: int = 15) -> EmbeddingProvider:
+    """Function to create the embedding backend for a model name"""
+    if model in LOCAL_EMBEDDING_PROVIDERS:
+        return LOCAL_EMBEDDING_PROVIDERS[model]()
+    return VoyageEmbeddingProvider(api_key, max_retries, timeout)
+
 async def get_embeddings_with_backoff(
-    client,
+    provider: EmbeddingProvider,
     batch_texts: List[str],
     model: str,
     max_retries: int = 5,
@@ -343,14 +494,7 @@ async def get_embeddings_with_backoff(
     for retry in range(max_retries):
         try:
             # Get embeddings
-            response = await client.embed(batch_texts, model=model)
-            
-            # Handle new API response format
-            if hasattr(response, 'embeddings'):
-                return response.embeddings
-            else:
-                # Old response format (just in case)
-                return [item for item in response]
+            return await provider.embed(batch_texts, model)
                 
         except Exception as e:
             # Raise exception on last retry
@@ -369,6 +513,126 @@ async def get_embeddings_with_backoff(
             # Increase wait time for next retry
             delay *= backoff_factor
 
+async def run_embedding_batches(
+    provider: EmbeddingProvider,
+    texts: List[str],
+    model: str,
+    batch_size: int,
+    max_retries: int,
+    start: int = 0,
+    max_tokens_per_batch: int = 100000,
+    max_concurrency: int = 4,
+    request_interval: float = 0.5,
+    max_tokens_per_minute: int = 0,
+    on_batch=None
+) -> Tuple[Dict[int, List[float]], List[int]]:
+    """Function to embed texts with several batches in flight
+    
+    Batches are cut from the texts in order (at most batch_size texts and 80% of
+    max_tokens_per_batch estimated tokens), sent by up to max_concurrency
+    concurrent requests and spaced by the request and token rate limits. A batch
+    that still fails after retries is split in half and re-sent, and later
+    batches are cut no larger; single texts that keep failing are skipped.
+    
+    Args:
+        provider (EmbeddingProvider): Embedding backend
+        texts (List[str]): Truncated texts
+        model (str): Embedding model name
+        batch_size (int): Maximum texts per request
+        max_retries (int): Retries of one request before it is split
+        start (int, optional): Index of the first text to embed. Default is 0.
+        max_tokens_per_batch (int, optional): Token limit per request
+        max_concurrency (int, optional): Requests in flight. Default is 4.
+        request_interval (float, optional): Minimum seconds between request starts (0=no limit)
+        max_tokens_per_minute (int, optional): Estimated token budget per minute (0=no limit)
+        on_batch (callable, optional): Called with (index of the first text, embeddings)
+            as each batch arrives, in completion order
+    
+    Returns:
+        Tuple[Dict[int, List[float]], List[int]]: Text index -> embedding, and the
+            indices of the texts that failed
+    """
+    token_counts = np.array([estimate_tokens(text) for text in texts], dtype=np.int64)
+    token_limit = max_tokens_per_batch * 0.8  # Use 80% threshold
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    request_limiter = RateLimiter(60.0 / request_interval, key="embedding_requests", shared=False) if request_interval > 0 else None
+    token_limiter = None
+    if max_tokens_per_minute > 0:
+        # One full batch may go out immediately; the budget is refilled continuously
+        token_limiter = RateLimiter(max_tokens_per_minute, burst=max_tokens_per_batch, key="embedding_tokens", shared=False)
+    
+    async def send(batch_start: int, count: int) -> List[List[float]]:
+        tokens = int(token_counts[batch_start:batch_start + count].sum())
+        async with semaphore:
+            if request_limiter is not None:
+                await request_limiter.acquire_async()
+            if token_limiter is not None:
+                await token_limiter.acquire_async(tokens)
+            embeddings = await get_embeddings_with_backoff(
+                provider,
+                texts[batch_start:batch_start + count],
+                model,
+                max_retries
+            )
+        if len(embeddings) != count:
+            raise ValueError(f"Expected {count} embeddings, got {len(embeddings)}")
+        return embeddings
+    
+    results = {}
+    failed = []
+    retry = deque()  # (first index, count) of split batches, re-sent before new ones
+    tasks = {}
+    cursor = start
+    size_limit = max(1, batch_size)
+    
+    try:
+        while cursor < len(texts) or retry or tasks:
+            # Keep a few batches queued behind the in-flight ones so rate limit waits overlap requests
+            while len(tasks) < 2 * max(1, max_concurrency) and (retry or cursor < len(texts)):
+                if retry:
+                    batch_start, count = retry.popleft()
+                else:
+                    batch_start = cursor
+                    count = min(size_limit, len(texts) - cursor)
+                    while count > 1 and token_counts[cursor:cursor + count].sum() > token_limit:
+                        count = max(1, count // 2)
+                    cursor += count
+                tasks[asyncio.ensure_future(send(batch_start, count))] = (batch_start, count)
+            
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                batch_start, count = tasks.pop(task)
+                try:
+                    embeddings = task.result()
+                except Exception as e:
+                    if count > 1:
+                        half = count // 2
+                        size_limit = min(size_limit, half)
+                        print(f"Error occurred during batch processing: {e}. "
+                              f"Retrying texts {batch_start}-{batch_start + count - 1} in batches of {half}")
+                        retry.extend([(batch_start, half), (batch_start + half, count - half)])
+                    else:
+                        # Record failed index instead of inserting zero vector
+                        # Zero vectors corrupt cosine similarity results silently
+                        print(f"Error processing individual text (index {batch_start}): {e}")
+                        failed.append(batch_start)
+                    continue
+                
+                # Grow back after an error, so one bad text does not keep batches small
+                size_limit = min(max(1, batch_size), size_limit * 2)
+                results.update(zip(range(batch_start, batch_start + count), embeddings))
+                print(f"Batch {batch_start}-{batch_start + count - 1}: Size {count}, "
+                      f"Estimated tokens {int(token_counts[batch_start:batch_start + count].sum())} "
+                      f"({len(results)}/{len(texts) - start} done)")
+                if on_batch is not None:
+                    on_batch(batch_start, embeddings)
+    finally:
+        # Stop outstanding requests if interrupted
+        for task in tasks:
+            task.cancel()
+    
+    return results, sorted(failed)
+
 async def get_embeddings(
     texts: List[str],
     model: str,
@@ -379,105 +643,96 @@ async def get_embeddings(
     resume: bool,
     max_tokens_per_item: int = 3000,
     max_tokens_per_batch: int = 100000,
-    api_key: str = None
+    api_key: str = None,
+    cache: Optional[EmbeddingCache] = None,
+    max_concurrency: int = 4,
+    max_tokens_per_minute: int = 0
 ) -> List[List[float]]:
-    """Function to get embeddings asynchronously (with token limit support)"""
-    # Get API key from environment variable
-    if api_key is None:
-        api_key = os.getenv("VOYAGE_API_KEY")
-    
-    if not api_key:
-        print("VOYAGE_API_KEY is not set")
-        raise ValueError("API key is not set")
-        
-    client = voyageai.AsyncClient(api_key=api_key, max_retries=max_retries, timeout=timeout)
-    
-    all_embeddings = []
-    start_idx = 0
+    """Function to get embeddings asynchronously (with token limit support)
     
-    # Load intermediate results if resuming
-    if resume:
-        all_embeddings, start_idx = load_temp_result()
+    Several batches are kept in flight (see run_embedding_batches) and the
+    embeddings are returned in the order of the texts.
     
+    With a cache, stored embeddings of the same model and text are returned
+    without an API call, identical texts are embedded once, and every batch
+    is stored as soon as it arrives (which also makes interrupted runs resumable).
+    """
     # Truncate texts to fit within token limit
     truncated_texts = [truncate_text_to_token_limit(text, max_tokens_per_item) for text in texts]
     
+    # Local embeddings are cheaper to recompute than to look up
+    if model in LOCAL_EMBEDDING_PROVIDERS:
+        cache = None
+    
+    cached_vectors = {}
+    pending_hashes = []
+    if cache is not None:
+        text_hashes = [get_text_hash(text) for text in truncated_texts]
+        cached_vectors = cache.get_many(model, text_hashes)
+        pending = {}
+        for text_hash, text in zip(text_hashes, truncated_texts):
+            if text_hash not in cached_vectors:
+                pending.setdefault(text_hash, text)
+        pending_hashes = list(pending)
+        hits = sum(text_hash in cached_vectors for text_hash in text_hashes)
+        print(f"Embedding cache: {hits} hits, {len(pending_hashes)} texts to embed ({cache.path})")
+        truncated_texts = list(pending.values())
+        if not truncated_texts:
+            return [cached_vectors[text_hash] for text_hash in text_hashes]
+    
+    provider = get_embedding_provider(model, api_key, max_retries, timeout)
+    
+    previous_embeddings = []
+    start_idx = 0
+    
+    # Load intermediate results if resuming (the cache already holds every finished batch)
+    if resume and cache is None:
+        previous_embeddings, start_idx = load_temp_result()
+    
     # Reduce default batch size by half (for safety)
     initial_batch_size = max(1, batch_size // 2)
     
-    i = start_idx
-    while i < len(truncated_texts):
-        # Start with small batch size
-        current_batch_size = initial_batch_size
-        batch_end = min(i + current_batch_size, len(truncated_texts))
-        batch_texts = truncated_texts[i:batch_end]
-        
-        # Estimate batch token count
-        batch_tokens = sum(estimate_tokens(text) for text in batch_texts)
-        
-        # Adjust batch size if tokens exceed limit
-        while batch_tokens > max_tokens_per_batch * 0.8 and current_batch_size > 1:  # Use 80% threshold
-            current_batch_size = max(1, current_batch_size // 2)
-            batch_end = min(i + current_batch_size, len(truncated_texts))
-            batch_texts = truncated_texts[i:batch_end]
-            batch_tokens = sum(estimate_tokens(text) for text in batch_texts)
-        
-        print(f"Batch {i//initial_batch_size + 1}: Size {len(batch_texts)}, Estimated tokens {batch_tokens}")
-        
-        # Get embeddings with exponential backoff
-        try:
-            batch_embeddings = await get_embeddings_with_backoff(
-                client,
-                batch_texts,
-                model,
-                max_retries
-            )
-            
-            all_embeddings.extend(batch_embeddings)
-            
-            # Save intermediate results
-            save_temp_result(all_embeddings, i + len(batch_texts))
-            
-        except Exception as e:
-            print(f"Error occurred during batch processing: {e}")
-            # Reduce batch size further and retry on error
-            if current_batch_size > 1:
-                print(f"Retrying with reduced batch size from {current_batch_size} to {max(1, current_batch_size // 2)}")
-                continue
-            else:
-                # Process texts individually if batch size is 1
-                print("Processing texts individually")
-                failed_indices = []
-                for single_text in batch_texts:
-                    try:
-                        single_embedding = await get_embeddings_with_backoff(
-                            client,
-                            [single_text],
-                            model,
-                            max_retries
-                        )
-                        all_embeddings.extend(single_embedding)
-                        save_temp_result(all_embeddings, i + 1)
-                        i += 1
-                    except Exception as single_error:
-                        print(f"Error processing individual text (index {i}): {single_error}")
-                        # Record failed index instead of inserting zero vector
-                        # Zero vectors corrupt cosine similarity results silently
-                        failed_indices.append(i)
-                        i += 1
-                if failed_indices:
-                    print(f"WARNING: {len(failed_indices)} items failed and were SKIPPED (not zero-filled): indices {failed_indices}")
-                    print("Re-run with --resume to retry, or check the source YAML files for these indices.")
-                continue
-        
-        # Wait before next request (rate limiting)
-        if i + len(batch_texts) < len(truncated_texts):
-            print(f"Waiting {request_interval} seconds before next request...")
-            await asyncio.sleep(request_interval)
-        
-        i += len(batch_texts)
+    results = {}
+    checkpoint = [start_idx]  # Every text before this index is embedded
+    
+    def store(batch_start, embeddings):
+        """Save embeddings as soon as their batch arrives"""
+        if cache is not None:
+            cache.put_many(model, pending_hashes[batch_start:batch_start + len(embeddings)], embeddings)
+            return
+        # Batches complete out of order: the temp file holds the leading run of
+        # finished texts, so --resume also retries texts that failed
+        results.update(zip(range(batch_start, batch_start + len(embeddings)), embeddings))
+        end = checkpoint[0]
+        while end in results:
+            end += 1
+        if end > checkpoint[0]:
+            save_temp_result(previous_embeddings + [results[i] for i in range(start_idx, end)], end)
+            checkpoint[0] = end
+    
+    embedded, failed_indices = await run_embedding_batches(
+        provider,
+        truncated_texts,
+        model,
+        initial_batch_size,
+        max_retries,
+        start=start_idx,
+        max_tokens_per_batch=max_tokens_per_batch,
+        max_concurrency=max_concurrency,
+        request_interval=request_interval if provider.remote else 0,
+        max_tokens_per_minute=max_tokens_per_minute if provider.remote else 0,
+        on_batch=store if provider.remote else None  # Local embeddings need no checkpoint
+    )
+    if failed_indices:
+        print(f"WARNING: {len(failed_indices)} items failed and were SKIPPED (not zero-filled): indices {failed_indices}")
+        print("Re-run with --resume to retry, or check the source YAML files for these indices.")
     
-    return all_embeddings
+    if cache is not None:
+        for position, embedding in embedded.items():
+            cached_vectors[pending_hashes[position]] = embedding
+        # Input order; texts that failed are skipped like without a cache
+        return [cached_vectors[text_hash] for text_hash in text_hashes if text_hash in cached_vectors]
+    return previous_embeddings + [embedded[i] for i in range(start_idx, len(truncated_texts)) if i in embedded]
 
 def calculate_similarity_matrix(embeddings_array: np.ndarray) -> np.ndarray:
     """Function to calculate similarity matrix from embeddings"""
@@ -489,10 +744,13 @@ def save_results(
     games: List[Dict[str, Any]],
     game_data_list: List[Dict[str, Any]],
     embeddings_array: np.ndarray,
-    similarity_matrix: np.ndarray,
-    file_metadata: Dict[str, str]
+    similarity_matrix: Optional[np.ndarray],
+    file_metadata: Dict[str, str],
+    ann_index: Any = None,
+    model: str = None,
+    text_hashes: List[str] = None
 ) -> None:
-    """Function to save results to file"""
+    """Function to save results to file (similarity_matrix is None for large catalogues)"""
     print(f"Saving results to {output_file}...")
     try:
         with open(output_file, 'wb') as f:
@@ -500,7 +758,11 @@ def save_results(
                 'games': games,
                 'game_data_list': game_data_list,
                 'embeddings': embeddings_array,
+                'embeddings_normalized': True,
                 'similarity_matrix': similarity_matrix,
+                'ann_index': ann_index,
+                'model': model,
+                'text_hashes': text_hashes,  # Per game, lets --incremental reuse embeddings
                 'metadata': file_metadata  # Save file metadata
             }, f)
         print("Saving completed")
@@ -512,8 +774,17 @@ def save_results(
     except Exception as e:
         print(f"Error during saving: {e}")
 
-def process_game_files(file_paths: List[str], limit: int = 0, skip: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
-    """Function to process game files and extract data"""
+def process_game_files(
+    file_paths: List[str],
+    limit: int = 0,
+    skip: int = 0,
+    workers: int = None,
+    reuse: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+    """Function to process game files and extract data (YAML parsing is spread over worker processes)
+    
+    Files in reuse (path -> (game entry, game data) of the previous run) are not parsed again.
+    """
     games = []
     game_data_list = []
     game_texts = []
@@ -527,9 +798,20 @@ def process_game_files(file_paths: List[str], limit: int = 0, skip: int = 0) ->
         print(f"Limiting number of files to process to {limit}")
         file_paths = file_paths[:limit]
     
+    reuse = reuse or {}
+    to_parse = [file_path for file_path in file_paths if file_path not in reuse]
+    if reuse:
+        print(f"Reusing {len(file_paths) - len(to_parse)} unchanged files from the previous run")
+    
     print("Loading game data...")
-    for file_path in tqdm(file_paths):
-        game_data = load_game_data(file_path)
+    parsed = {}
+    for file_path, game_data, error in tqdm(iter_game_files(to_parse, parallel=workers), total=len(to_parse)):
+        if error:
+            print(f"Error reading file {file_path}: {error}")
+        parsed[file_path] = game_data
+    
+    for file_path in file_paths:
+        game_data = reuse[file_path][1] if file_path in reuse else parsed.get(file_path)
         if not game_data:
             continue
             
@@ -547,6 +829,44 @@ def process_game_files(file_paths: List[str], limit: int = 0, skip: int = 0) ->
     print(f"Processed {len(games)} game data")
     return games, game_data_list, game_texts
 
+def get_text_hash(text: str) -> str:
+    """Function to calculate the hash identifying the text sent to the embedding API"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def load_reusable_results(output_file: str, model: str) -> Dict[str, Any]:
+    """Function to load what an incremental run can take over from the previous output
+    
+    Returns:
+        Dict[str, Any]: 'vectors' (text hash -> embedding; empty if the previous
+            run used another model or predates text hashes), 'games_by_file'
+            (file path -> (game entry, game data)), 'metadata' and 'ann_index'
+    """
+    reusable = {'vectors': {}, 'games_by_file': {}, 'metadata': {}, 'ann_index': None}
+    if not os.path.exists(output_file):
+        return reusable
+    try:
+        with open(output_file, 'rb') as f:
+            data = pickle.load(f)
+    except Exception as e:
+        print(f"Error loading previous processing results: {e}")
+        return reusable
+    
+    games = data.get('games', [])
+    reusable['games_by_file'] = {
+        game['file']: (game, game_data)
+        for game, game_data in zip(games, data.get('game_data_list', []))
+        if isinstance(game, dict) and 'file' in game
+    }
+    reusable['metadata'] = data.get('metadata', {})
+    reusable['ann_index'] = data.get('ann_index')
+    
+    text_hashes = data.get('text_hashes')
+    if data.get('model') != model or not text_hashes:
+        print(f"Previous embeddings were not made with {model} (or have no text hashes); embedding all games")
+        return reusable
+    reusable['vectors'] = dict(zip(text_hashes, data['embeddings']))
+    return reusable
+
 def load_previous_results(output_file: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], np.ndarray, np.ndarray]:
     """Function to load previous processing results"""
     try:
@@ -597,8 +917,19 @@ async def main_async():
         elif args.force:
             print("Force execution with --force option.")
         
+        # Incremental mode: unchanged files are not parsed again and unchanged texts not embedded again
+        reusable = load_reusable_results(args.output, args.model) if args.incremental else None
+        reuse_files = None
+        if reusable:
+            reuse_files = {
+                file_path: entry for file_path, entry in reusable['games_by_file'].items()
+                if file_path in current_metadata and reusable['metadata'].get(file_path) == current_metadata[file_path]
+            }
+        
         # Process game data
-        games, game_data_list, game_texts = process_game_files(game_files, args.limit, args.skip)
+        games, game_data_list, game_texts = process_game_files(
+            game_files, args.limit, args.skip, args.workers, reuse=reuse_files
+        )
         
         if not games:
             print("No valid game data.")
@@ -610,24 +941,56 @@ async def main_async():
             print(f"API key: {masked_key}")
         
         # Get embeddings
-        print(f"Calculating embeddings... Model: {args.model}, Batch size: {args.batch_size}")
+        print(f"Calculating embeddings... Model: {args.model}, Batch size: {args.batch_size}, "
+              f"Concurrency: {args.max_concurrency}")
         print(f"Max tokens per item: {args.max_tokens_per_item}, Max tokens per batch: {args.max_tokens_per_batch}")
 
-        embeddings = await get_embeddings(
-            game_texts, 
-            args.model,
-            args.batch_size,
-            args.max_retries,
-            args.request_interval,
-            args.timeout,
-            args.resume,
-            args.max_tokens_per_item,
-            args.max_tokens_per_batch,
-            args.api_key
-        )
+        # Texts as sent to the API; their hashes identify embeddings that can be reused
+        game_texts = [truncate_text_to_token_limit(text, args.max_tokens_per_item) for text in game_texts]
+        text_hashes = [get_text_hash(text) for text in game_texts]
+        previous_vectors = reusable['vectors'] if reusable else {}
+        missing = [i for i, text_hash in enumerate(text_hashes) if text_hash not in previous_vectors]
+        if args.incremental:
+            print(f"Incremental: reusing {len(games) - len(missing)} embeddings, embedding {len(missing)} new or changed games")
         
-        # Convert embeddings array to NumPy array
-        embeddings_array = np.array(embeddings)
+        new_embeddings = []
+        if missing:
+            use_cache = not args.no_embedding_cache and args.model not in LOCAL_EMBEDDING_PROVIDERS
+            cache = EmbeddingCache(args.embedding_cache) if use_cache else None
+            new_embeddings = await get_embeddings(
+                [game_texts[i] for i in missing],
+                args.model,
+                args.batch_size,
+                args.max_retries,
+                args.request_interval,
+                args.timeout,
+                args.resume,
+                args.max_tokens_per_item,
+                args.max_tokens_per_batch,
+                args.api_key,
+                cache=cache,
+                max_concurrency=args.max_concurrency,
+                max_tokens_per_minute=args.max_tokens_per_minute
+            )
+            if cache is not None:
+                cache.close()
+        
+        if len(missing) == len(games):
+            embeddings = new_embeddings
+        elif len(new_embeddings) != len(missing):
+            # Failed items are skipped by get_embeddings, so new vectors cannot be matched to games
+            print(f"ERROR: got {len(new_embeddings)} embeddings for {len(missing)} new or changed games. "
+                  f"Keeping the previous {args.output}; re-run to retry.")
+            return
+        else:
+            new_by_index = dict(zip(missing, new_embeddings))
+            embeddings = [
+                new_by_index[i] if i in new_by_index else previous_vectors[text_hash]
+                for i, text_hash in enumerate(text_hashes)
+            ]
+        
+        # Convert embeddings to L2-normalized float32 (cosine similarity becomes a dot product)
+        embeddings_array = normalize_embeddings(np.array(embeddings))
         
         # Guard: embedding count must match game count (can differ if items were skipped)
         if len(embeddings_array) != len(games):
@@ -637,12 +1000,37 @@ async def main_async():
             )
             games = games[:len(embeddings_array)]
             game_data_list = game_data_list[:len(embeddings_array)]
+            text_hashes = text_hashes[:len(embeddings_array)]
         
-        # Calculate similarity matrix
-        similarity_matrix = calculate_similarity_matrix(embeddings_array)
+        # Calculate similarity matrix (O(N²) memory, so only for small catalogues)
+        if len(embeddings_array) <= args.dense_matrix_max_games:
+            similarity_matrix = calculate_similarity_matrix(embeddings_array)
+        else:
+            print(f"{len(embeddings_array)} games > --dense_matrix_max_games {args.dense_matrix_max_games}: "
+                  "storing normalized embeddings only, similarities are computed per query")
+            similarity_matrix = None
+        
+        # Approximate nearest-neighbour index (queried with a recall / latency knob on the similarity page)
+        ann_kind = args.ann_index
+        if ann_kind == 'auto':
+            ann_kind = 'ivf' if len(embeddings_array) > ANN_MIN_GAMES else 'none'
+        ann_index = None
+        if ann_kind != 'none':
+            print(f"Building {ann_kind} ANN index...")
+            # Incremental runs keep the previous centroids and only reassign the games
+            previous_index = reusable['ann_index'] if reusable else None
+            centroids = None
+            if (getattr(previous_index, 'kind', None) == ann_kind
+                    and previous_index.centroids.shape[1] == embeddings_array.shape[1]
+                    and args.ann_lists in (None, previous_index.n_lists)):
+                centroids = previous_index.centroids
+            ann_index = ANN_INDEX_TYPES[ann_kind].build(embeddings_array, n_lists=args.ann_lists, centroids=centroids)
         
         # Save results (including metadata)
-        save_results(args.output, games, game_data_list, embeddings_array, similarity_matrix, current_metadata)
+        save_results(
+            args.output, games, game_data_list, embeddings_array, similarity_matrix, current_metadata,
+            ann_index=ann_index, model=args.model, text_hashes=text_hashes
+        )
         
         print(f"Processing completed. Generated {len(embeddings_array)} embeddings.")
         
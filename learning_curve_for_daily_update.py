@@ -6,7 +6,7 @@ Optimized for daily_update.py
 import datetime
 import math
 import os
-import yaml
+from src.data.yaml_io import load_yaml
 
 # Configuration file paths
 CONFIG_DIR = "config"
@@ -21,7 +21,7 @@ def load_yaml_config(file_path, default_value=None):
         return default_value or {}
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            data = yaml.safe_load(file)
+            data = load_yaml(file)
         if data is None:
             return {}
         return data
@@ -1,6 +1,6 @@
 import os
-import yaml
 from datetime import datetime, timedelta
+from src.data.yaml_io import load_yaml, dump_yaml_file, file_lock
 
 # Path to YAML file
 CATEGORIES_DATA_FILE = "config/categories_data.yaml"
@@ -38,7 +38,7 @@ def load_categories_data(force_reload=False):
             return _categories_cache
 
         with open(CATEGORIES_DATA_FILE, 'r', encoding='utf-8') as file:
-            complexity_data = yaml.safe_load(file)
+            complexity_data = load_yaml(file)
 
         # Return empty dictionary if None
         if complexity_data is None:
@@ -68,8 +68,7 @@ def save_categories_data(complexity_data):
     global _categories_cache, _categories_cache_timestamp
 
     try:
-        with open(CATEGORIES_DATA_FILE, 'w', encoding='utf-8') as file:
-            yaml.dump(complexity_data, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        dump_yaml_file(complexity_data, CATEGORIES_DATA_FILE)
 
         # Update cache
         _categories_cache = complexity_data
@@ -140,16 +139,18 @@ def _save_pending_categories():
         return True
 
     try:
-        # Load current data (force reload)
-        complexity_data = load_categories_data(force_reload=True)
-
-        # Add buffer contents
-        for category_name, category_data in _pending_categories.items():
-            if category_name not in complexity_data:
-                complexity_data[category_name] = category_data
-
-        # Save
-        success = save_categories_data(complexity_data)
+        # Hold the lock across reload and save so concurrent writers do not drop each other's entries
+        with file_lock(CATEGORIES_DATA_FILE):
+            # Load current data (force reload)
+            complexity_data = load_categories_data(force_reload=True)
+
+            # Add buffer contents
+            for category_name, category_data in _pending_categories.items():
+                if category_name not in complexity_data:
+                    complexity_data[category_name] = category_data
+
+            # Save
+            success = save_categories_data(complexity_data)
 
         if success:
             # Clear buffer
@@ -0,0 +1,100 @@
+"""
+src/analysis/embedding_cache.py - Persistent store of embedding vectors
+
+Embeddings are kept in a SQLite database keyed on (model, SHA-256 of the text
+sent to the API) as float32 blobs, independently of the pickle written by
+generate_embedding_model.py. Re-runs, interrupted runs and A/B comparisons of
+models therefore only pay for texts that were never embedded with that model.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, List
+import numpy as np
+
+# Default database location (EMBEDDING_CACHE_PATH overrides it)
+DEFAULT_EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("cache", "embeddings.sqlite3"))
+
+# Hashes per SELECT (stays below SQLite's bound parameter limit)
+_LOOKUP_CHUNK = 500
+
+class EmbeddingCache:
+    """SQLite-backed embedding store, safe to share between threads and processes"""
+
+    def __init__(self, path: str = DEFAULT_EMBEDDING_CACHE_PATH):
+        """
+        Args:
+            path (str, optional): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (model, text_hash)) WITHOUT ROWID"
+            )
+
+    def get_many(self, model: str, text_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Function to look up stored embeddings
+
+        Args:
+            model (str): Embedding model name
+            text_hashes (Iterable[str]): Hashes of the texts (see generate_embedding_model.get_text_hash)
+
+        Returns:
+            Dict[str, np.ndarray]: Text hash -> float32 vector, for the hashes that are stored
+        """
+        text_hashes = list(dict.fromkeys(text_hashes))
+        found = {}
+        for start in range(0, len(text_hashes), _LOOKUP_CHUNK):
+            chunk = text_hashes[start:start + _LOOKUP_CHUNK]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(chunk))})",
+                    (model, *chunk)
+                ).fetchall()
+            for text_hash, vector in rows:
+                found[text_hash] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, text_hashes: List[str], vectors: List[List[float]]) -> None:
+        """Function to store embeddings (existing entries are replaced)
+
+        Args:
+            model (str): Embedding model name
+            text_hashes (List[str]): Hashes of the embedded texts
+            vectors (List[List[float]]): Embedding of each text, stored as float32
+        """
+        now = time.time()
+        rows = [
+            (model, text_hash, sqlite3.Binary(np.asarray(vector, dtype=np.float32).tobytes()), now)
+            for text_hash, vector in zip(text_hashes, vectors)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def count(self, model: str = None) -> int:
+        """Number of stored embeddings (of one model, or of all models)"""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
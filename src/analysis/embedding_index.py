@@ -0,0 +1,313 @@
+"""
+src/analysis/embedding_index.py - Similarity scoring from normalized embeddings
+
+A dense N×N cosine similarity matrix needs O(N²) memory (about 20 GB in
+float64 at 50k games). SimilarityView stores only the L2-normalized float32
+embeddings and computes similarity rows on demand with one matrix-vector
+product, while supporting the indexing the similarity page uses on the matrix
+(``view[i]``, ``view[i][j]`` and ``view[np.ix_(rows, cols)]``).
+
+For catalogues where even one exact row per query is too slow, an approximate
+nearest-neighbour index (IVFIndex: k-means coarse quantizer with inverted
+lists) can be built next to the embeddings; n_probe trades recall for latency.
+"""
+
+from collections import OrderedDict
+import threading
+from typing import Any, Dict, Optional
+import numpy as np
+
+# Catalogues up to this size also store the dense similarity matrix by default
+DENSE_MATRIX_MAX_GAMES = 5000
+
+# Number of recently computed similarity rows kept by SimilarityView
+ROW_CACHE_SIZE = 16
+
+# Catalogues larger than this get an ANN index by default (generate_embedding_model --ann_index auto)
+ANN_MIN_GAMES = DENSE_MATRIX_MAX_GAMES
+
+# Rows per block when scoring many embeddings against the centroids
+_ASSIGN_CHUNK = 8192
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """Function to L2-normalize embeddings row-wise as float32
+
+    Args:
+        embeddings (np.ndarray): Embeddings (N×D)
+
+    Returns:
+        np.ndarray: Unit-length float32 embeddings (zero vectors stay zero)
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    if embeddings.ndim != 2:
+        return np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(embeddings / norms, dtype=np.float32)
+
+def _rank_candidates(candidates: np.ndarray, scores: np.ndarray, k: int):
+    """Top-k of candidate indices by score (best first, ties by lower index)"""
+    k = min(k, len(candidates))
+    if k == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    if k < len(candidates):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(candidates))
+    top = top[np.lexsort((candidates[top], -scores[top]))]
+    return candidates[top].astype(np.int64), scores[top].astype(np.float64)
+
+class IVFIndex:
+    """Inverted-file ANN index over normalized embeddings
+
+    Embeddings are grouped by their nearest k-means centroid. A query scores
+    only the members of the n_probe lists whose centroids are closest to it,
+    so cost grows with n_probe / n_lists of the catalogue instead of all of it.
+    
+    Queries scan a list-ordered copy of the embeddings (contiguous slices are
+    several times faster than gathering scattered rows). The copy is not
+    pickled; attach() rebuilds it from the embeddings after loading.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, members: np.ndarray):
+        """
+        Args:
+            centroids (np.ndarray): Normalized centroids (n_lists×D, float32)
+            offsets (np.ndarray): Start of each list in members (n_lists + 1)
+            members (np.ndarray): Embedding indices grouped by list
+        """
+        self.centroids = centroids
+        self.offsets = offsets
+        self.members = members
+        self.vectors = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['vectors'] = None
+        return state
+
+    def attach(self, embeddings: np.ndarray) -> None:
+        """Function to prepare the index for queries on the embeddings it was built on
+
+        Args:
+            embeddings (np.ndarray): Normalized float32 embeddings
+        """
+        self.vectors = np.ascontiguousarray(embeddings[self.members])
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def default_n_probe(self) -> int:
+        """Lists probed when the caller does not choose (about 1/8 of them)"""
+        return max(1, min(self.n_lists, int(np.ceil(self.n_lists / 8))))
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Index of the most similar centroid for each vector"""
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), _ASSIGN_CHUNK):
+            block = vectors[start:start + _ASSIGN_CHUNK]
+            assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignment
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        n_lists: Optional[int] = None,
+        iterations: int = 10,
+        sample_size: Optional[int] = None,
+        seed: int = 0,
+        centroids: Optional[np.ndarray] = None
+    ) -> "IVFIndex":
+        """Function to build the index with spherical k-means
+
+        Args:
+            embeddings (np.ndarray): Normalized float32 embeddings
+            n_lists (Optional[int], optional): Number of lists. Default is sqrt(N).
+            iterations (int, optional): k-means iterations. Default is 10.
+            sample_size (Optional[int], optional): Embeddings used to train the
+                centroids. Default is 64 per list.
+            seed (int, optional): Random seed. Default is 0.
+            centroids (Optional[np.ndarray], optional): Centroids of a previous build
+                to reuse; k-means is skipped and the embeddings are only reassigned
+
+        Returns:
+            IVFIndex: Built index
+        """
+        if centroids is not None:
+            return cls._from_assignment(embeddings, centroids)
+        
+        rng = np.random.default_rng(seed)
+        n = len(embeddings)
+        n_lists = min(n, n_lists or max(1, int(round(np.sqrt(n)))))
+        sample_size = min(n, sample_size or 64 * n_lists)
+        sample = embeddings[np.sort(rng.choice(n, sample_size, replace=False))] if sample_size < n else embeddings
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = cls._assign(sample, centroids)
+            order = np.argsort(assignment, kind='stable')
+            counts = np.bincount(assignment, minlength=n_lists)
+            filled = np.flatnonzero(counts)
+            sums = np.zeros(centroids.shape, dtype=np.float64)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+            sums[filled] = np.add.reduceat(sample[order].astype(np.float64), starts, axis=0)
+            # Re-seed empty lists with random sample vectors
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+            centroids = normalize_embeddings(sums)
+
+        return cls._from_assignment(embeddings, centroids)
+
+    @classmethod
+    def _from_assignment(cls, embeddings: np.ndarray, centroids: np.ndarray) -> "IVFIndex":
+        """Build the inverted lists by assigning every embedding to its nearest centroid"""
+        assignment = cls._assign(embeddings, centroids)
+        members = np.argsort(assignment, kind='stable').astype(np.int32)
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=len(centroids))))).astype(np.int64)
+        index = cls(centroids, offsets, members)
+        index.attach(embeddings)
+        return index
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        n_probe: Optional[int] = None,
+        mask: Optional[np.ndarray] = None,
+        exclude: Optional[int] = None
+    ):
+        """Function to find approximately the k embeddings most similar to a query
+
+        Args:
+            query (np.ndarray): Normalized query vector
+            k (int): Number of results
+            n_probe (Optional[int], optional): Lists to scan (higher = better recall, slower)
+            mask (Optional[np.ndarray], optional): Boolean mask of indices that may be returned
+            exclude (Optional[int], optional): Index never returned (e.g. the query game)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Indices and similarities, best first
+        """
+        n_probe = min(self.n_lists, max(1, n_probe or self.default_n_probe))
+        centroid_scores = self.centroids @ query
+        if n_probe < self.n_lists:
+            probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        else:
+            probe = np.arange(self.n_lists)
+
+        slices = [slice(self.offsets[l], self.offsets[l + 1]) for l in probe]
+        candidates = np.concatenate([self.members[s] for s in slices])
+        scores = np.concatenate([self.vectors[s] @ query for s in slices])
+        keep = np.ones(len(candidates), dtype=np.bool_) if mask is None else mask[candidates]
+        if exclude is not None:
+            keep &= candidates != exclude
+        return _rank_candidates(candidates[keep], scores[keep], k)
+
+# Available ANN index types by name (generate_embedding_model --ann_index)
+ANN_INDEX_TYPES = {IVFIndex.kind: IVFIndex}
+
+class SimilarityView:
+    """Read-only stand-in for a cosine similarity matrix, computed from normalized embeddings"""
+
+    def __init__(self, normalized_embeddings: np.ndarray, row_cache_size: int = ROW_CACHE_SIZE, ann_index=None):
+        """
+        Args:
+            normalized_embeddings (np.ndarray): L2-normalized float32 embeddings (see normalize_embeddings)
+            row_cache_size (int, optional): Number of similarity rows to keep
+            ann_index (optional): ANN index built on the embeddings (e.g. IVFIndex)
+        """
+        self.embeddings = normalized_embeddings
+        self.ann_index = ann_index
+        if ann_index is not None and ann_index.vectors is None:
+            ann_index.attach(normalized_embeddings)
+        self._row_cache_size = row_cache_size
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return (len(self.embeddings), len(self.embeddings))
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    def row(self, index: int) -> np.ndarray:
+        """Function to get the similarities of one game to all games
+
+        Args:
+            index (int): Game index
+
+        Returns:
+            np.ndarray: float64 similarity row of length N (read-only)
+        """
+        index = int(index)
+        with self._lock:
+            row = self._rows.get(index)
+            if row is not None:
+                self._rows.move_to_end(index)
+                return row
+
+        row = (self.embeddings @ self.embeddings[index]).astype(np.float64)
+        row.flags.writeable = False
+        with self._lock:
+            self._rows[index] = row
+            while len(self._rows) > self._row_cache_size:
+                self._rows.popitem(last=False)
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, cols = key
+            # np.ix_ yields an (n, 1) and a (1, m) array: compute the n×m block
+            rows = np.asarray(rows).reshape(-1)
+            cols = np.asarray(cols).reshape(-1)
+            return (self.embeddings[rows] @ self.embeddings[cols].T).astype(np.float64)
+        return self.row(key)
+
+    def search(self, index: int, k: int, n_probe: Optional[int] = None, mask: Optional[np.ndarray] = None):
+        """Function to find approximately the k games most similar to a game via the ANN index
+
+        Args:
+            index (int): Game index (never part of the result)
+            k (int): Number of results
+            n_probe (Optional[int], optional): Recall / latency knob of the index
+            mask (Optional[np.ndarray], optional): Boolean mask of games that may be returned
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Indices and similarities, best first
+        """
+        index = int(index)
+        return self.ann_index.search(self.embeddings[index], k, n_probe=n_probe, mask=mask, exclude=index)
+
+    def to_dense(self) -> np.ndarray:
+        """Function to materialize the full matrix (O(N²) memory, small catalogues only)"""
+        return (self.embeddings @ self.embeddings.T).astype(np.float64)
+
+def get_similarity_source(data: Dict[str, Any]):
+    """Function to choose what to score similarities with for loaded embedding data
+
+    Uses the stored dense matrix when present, otherwise a SimilarityView over
+    the normalized embeddings. A stored ANN index always selects the view (its
+    exact rows equal the matrix rows), since the similarity page offers the
+    n_probe control only for a source exposing ann_index.
+
+    Args:
+        data (Dict[str, Any]): Loaded embedding data (see similarity.load_data)
+
+    Returns:
+        np.ndarray or SimilarityView: Object indexable like a similarity matrix
+    """
+    matrix = data.get('similarity_matrix')
+    if matrix is not None and np.size(matrix) and data.get('ann_index') is None:
+        return matrix
+    embeddings = data['embeddings']
+    if not data.get('embeddings_normalized'):
+        embeddings = normalize_embeddings(embeddings)
+    return SimilarityView(embeddings, ann_index=data.get('ann_index'))
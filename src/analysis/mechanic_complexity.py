@@ -1,6 +1,6 @@
 import os
-import yaml
 from datetime import datetime, timedelta
+from src.data.yaml_io import load_yaml, dump_yaml_file, file_lock
 
 # Path to YAML file
 MECHANICS_DATA_FILE = "config/mechanics_data.yaml"
@@ -38,7 +38,7 @@ def load_mechanics_data(force_reload=False):
             return _mechanics_cache
         
         with open(MECHANICS_DATA_FILE, 'r', encoding='utf-8') as file:
-            complexity_data = yaml.safe_load(file)
+            complexity_data = load_yaml(file)
             
         # Return empty dictionary if None
         if complexity_data is None:
@@ -67,8 +67,7 @@ def save_mechanics_data(complexity_data):
     global _mechanics_cache, _mechanics_cache_timestamp
     
     try:
-        with open(MECHANICS_DATA_FILE, 'w', encoding='utf-8') as file:
-            yaml.dump(complexity_data, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        dump_yaml_file(complexity_data, MECHANICS_DATA_FILE)
         
         # Update cache
         _mechanics_cache = complexity_data
@@ -136,16 +135,18 @@ def _save_pending_mechanics():
         return True
         
     try:
-        # Load current data (force reload)
-        complexity_data = load_mechanics_data(force_reload=True)
+        # Hold the lock across reload and save so concurrent writers do not drop each other's entries
+        with file_lock(MECHANICS_DATA_FILE):
+            # Load current data (force reload)
+            complexity_data = load_mechanics_data(force_reload=True)
         
-        # Add buffer contents
-        for mechanic_name, mechanic_data in _pending_mechanics.items():
-            if mechanic_name not in complexity_data:
-                complexity_data[mechanic_name] = mechanic_data
+            # Add buffer contents
+            for mechanic_name, mechanic_data in _pending_mechanics.items():
+                if mechanic_name not in complexity_data:
+                    complexity_data[mechanic_name] = mechanic_data
         
-        # Save
-        success = save_mechanics_data(complexity_data)
+            # Save
+            success = save_mechanics_data(complexity_data)
         
         if success:
             # Clear buffer
@@ -1,7 +1,7 @@
 import os
-import yaml
 import math
 from datetime import datetime, timedelta
+from src.data.yaml_io import load_yaml, dump_yaml_file, file_lock
 
 # Path to YAML file
 RANK_COMPLEXITY_FILE = "config/rank_complexity.yaml"
@@ -39,7 +39,7 @@ def load_rank_complexity_data(force_reload=False):
             return _rank_cache
 
         with open(RANK_COMPLEXITY_FILE, 'r', encoding='utf-8') as file:
-            complexity_data = yaml.safe_load(file)
+            complexity_data = load_yaml(file)
 
         # Return empty dictionary if None
         if complexity_data is None:
@@ -69,8 +69,7 @@ def save_rank_complexity_data(complexity_data):
     global _rank_cache, _rank_cache_timestamp
 
     try:
-        with open(RANK_COMPLEXITY_FILE, 'w', encoding='utf-8') as file:
-            yaml.dump(complexity_data, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        dump_yaml_file(complexity_data, RANK_COMPLEXITY_FILE)
 
         # Update cache
         _rank_cache = complexity_data
@@ -141,16 +140,18 @@ def _save_pending_rank_types():
         return True
 
     try:
-        # Load current data (force reload)
-        complexity_data = load_rank_complexity_data(force_reload=True)
-
-        # Add buffer contents
-        for rank_type, rank_data in _pending_rank_types.items():
-            if rank_type not in complexity_data:
-                complexity_data[rank_type] = rank_data
-
-        # Save
-        success = save_rank_complexity_data(complexity_data)
+        # Hold the lock across reload and save so concurrent writers do not drop each other's entries
+        with file_lock(RANK_COMPLEXITY_FILE):
+            # Load current data (force reload)
+            complexity_data = load_rank_complexity_data(force_reload=True)
+
+            # Add buffer contents
+            for rank_type, rank_data in _pending_rank_types.items():
+                if rank_type not in complexity_data:
+                    complexity_data[rank_type] = rank_data
+
+            # Save
+            success = save_rank_complexity_data(complexity_data)
 
         if success:
             # Clear buffer
@@ -9,9 +9,11 @@ import matplotlib.pyplot as plt
 import matplotlib
 import seaborn as sns
 import pandas as pd
-from collections import Counter
+from collections import Counter, OrderedDict
 import io
-from typing import Dict, List, Any, Tuple, Optional
+import hashlib
+import threading
+from typing import Dict, List, Any, Tuple, Optional, Union
 import logging
 import os
 import platform
@@ -31,6 +33,9 @@ from src.analysis.rank_complexity import (
     get_rank_complexity_value
 )
 
+from src.data.game_table import GameTable
+from src.analysis.embedding_index import get_similarity_source
+
 # Import language utilities
 from src.utils.language import t, get_game_display_name, get_game_secondary_name, format_language_caption
 
@@ -104,8 +109,8 @@ def _load_data_impl(data_file: str) -> Optional[Dict[str, Any]]:
         with open(data_file, 'rb') as f:
             data = pickle.load(f)
             
-        # Validate data
-        required_keys = ['games', 'game_data_list', 'embeddings', 'similarity_matrix']
+        # Validate data (similarity_matrix is optional, see below)
+        required_keys = ['games', 'game_data_list', 'embeddings']
         for key in required_keys:
             if key not in data:
                 logger.error(t("errors.missing_data_key", key=key))
@@ -113,6 +118,13 @@ def _load_data_impl(data_file: str) -> Optional[Dict[str, Any]]:
         
         # Process game data to add unknown mechanics/categories/rankings to YAML
         process_game_data_for_yaml(data['game_data_list'])
+        
+        # Without a stored dense matrix, similarity rows are computed from the
+        # normalized embeddings per query (O(N·D) memory instead of O(N²))
+        data['similarity_matrix'] = get_similarity_source(data)
+        
+        # Columnar view (metrics, mechanics / categories one-hot) built once per load
+        data['game_table'] = GameTable(data['game_data_list'])
                 
         return data
     except Exception as e:
@@ -168,15 +180,23 @@ def process_game_data_for_yaml(game_data_list: List[Dict[str, Any]]) -> None:
         logger.error(t("errors.yaml_processing_error", error=str(e)))
 
 # Extract list of categories and mechanics
-def extract_categories_and_mechanics(game_data_list: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+def extract_categories_and_mechanics(
+    game_data_list: List[Dict[str, Any]],
+    game_table: Optional[GameTable] = None
+) -> Tuple[List[str], List[str]]:
     """Function to extract list of categories and mechanics from game data
     
     Args:
         game_data_list (List[Dict[str, Any]]): List of game data
+        game_table (Optional[GameTable], optional): Columnar view of game_data_list or of
+            the whole catalogue (see get_game_table). Its vocabularies are returned directly when given.
         
     Returns:
         Tuple[List[str], List[str]]: Lists of categories and mechanics
     """
+    if game_table is not None:
+        return list(game_table.category_vocabulary), list(game_table.mechanic_vocabulary)
+    
     all_categories = set()
     all_mechanics = set()
     
@@ -230,9 +250,15 @@ def display_filter_ui(
                 default=st.session_state.mechanics_filter
             )
         
+        match_all = st.checkbox(
+            t("similarity.filter_match_all"),
+            value=st.session_state.get("filter_match_all", False)
+        )
+        
         # Save selections
         st.session_state.category_filter = selected_categories
         st.session_state.mechanics_filter = selected_mechanics
+        st.session_state.filter_match_all = match_all
     
     return selected_categories, selected_mechanics
 
@@ -241,15 +267,23 @@ def filter_games(
     games: List[Dict[str, Any]],
     game_data_list: List[Dict[str, Any]],
     categories: List[str],
-    mechanics: List[str]
+    mechanics: List[str],
+    match_all: bool = False,
+    game_table: Optional[GameTable] = None
 ) -> List[int]:
     """Function to filter games
     
+    A game matches if it has any of the selected categories and any of the
+    selected mechanics (every selected one with match_all).
+    
     Args:
         games (List[Dict[str, Any]]): List of game information
         game_data_list (List[Dict[str, Any]]): List of game data
         categories (List[str]): List of categories to filter
         mechanics (List[str]): List of mechanics to filter
+        match_all (bool, optional): Require all selected categories and mechanics. Default is False.
+        game_table (Optional[GameTable], optional): Columnar view of game_data_list;
+            its inverted indexes turn filtering into boolean mask operations
         
     Returns:
         List[int]: List of filtered game indices
@@ -257,6 +291,9 @@ def filter_games(
     if not categories and not mechanics:
         return list(range(len(games)))
     
+    if game_table is not None:
+        return np.flatnonzero(game_table.filter_mask(categories, mechanics, match_all)).tolist()
+    
     filtered_indices = []
     
     for i, game_data in enumerate(game_data_list):
@@ -268,8 +305,8 @@ def filter_games(
                 game_categories = set(cat.get('name', '') for cat in game_data['categories'] 
                                     if isinstance(cat, dict) and 'name' in cat)
             
-            # Check if any category matches
-            if not any(cat in game_categories for cat in categories):
+            # Check if any (or every) category matches
+            if not (all if match_all else any)(cat in game_categories for cat in categories):
                 match = False
         
         if mechanics and match:
@@ -278,8 +315,8 @@ def filter_games(
                 game_mechanics = set(mech.get('name', '') for mech in game_data['mechanics'] 
                                    if isinstance(mech, dict) and 'name' in mech)
             
-            # Check if any mechanics matches
-            if not any(mech in game_mechanics for mech in mechanics):
+            # Check if any (or every) mechanics matches
+            if not (all if match_all else any)(mech in game_mechanics for mech in mechanics):
                 match = False
         
         if match:
@@ -385,13 +422,117 @@ def display_similar_game_card(
     # Display game card
     display_game_card(game_data_list[idx])
 
+# Memoized top-k rankings keyed by (selected_index, filter mask, n_probe), see top_k_similar
+_TOP_K_CACHE_SIZE = 32
+# Rankings are computed at least this deep so callers asking for 10 or 20 share one pass
+_TOP_K_MIN_DEPTH = 50
+_top_k_cache = OrderedDict()
+_top_k_lock = threading.Lock()
+
+def _rank_similar(
+    similarities: np.ndarray,
+    selected_index: int,
+    k: int,
+    mask: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """Rank the k most similar eligible games with argpartition plus a sort of the k candidates
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, bool]: Indices and similarities (best first),
+            and whether every eligible game is included
+    """
+    scores = np.array(similarities, dtype=np.float64)
+    if mask is not None:
+        scores[~mask] = -np.inf
+    scores[selected_index] = -np.inf
+    eligible = int(np.count_nonzero(scores != -np.inf))
+    
+    k = min(k, eligible)
+    if k == 0:
+        return np.array([], dtype=np.int64), np.array([]), True
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    # Stable sort of the candidates (in index order) breaks ties by lower index
+    candidates.sort()
+    ranked = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+    return ranked, scores[ranked], k == eligible
+
+def top_k_similar(
+    selected_index: int,
+    similarity_matrix: np.ndarray,
+    k: int,
+    mask: Optional[np.ndarray] = None,
+    threshold: Optional[float] = None,
+    n_probe: Optional[int] = None,
+    return_scores: bool = False
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Function to get the indices of the k games most similar to the selected game
+    
+    Uses np.argpartition (O(N)) instead of sorting the whole similarity row.
+    Rankings are memoized per (selected_index, mask), so the game list, heatmap
+    and distribution tabs of one page render share a single pass over the row.
+    
+    Args:
+        selected_index (int): Selected game index (never part of the result)
+        similarity_matrix (np.ndarray): Similarity matrix
+        k (int): Number of games to get
+        mask (Optional[np.ndarray], optional): Boolean mask of games that may be returned
+        threshold (Optional[float], optional): Minimum similarity. Default is no threshold.
+        n_probe (Optional[int], optional): Query the approximate nearest-neighbour
+            index of the similarity source with this many lists probed
+            (higher = better recall, slower). Exact when None or no index is loaded.
+        return_scores (bool, optional): Also return the similarities of the games,
+            so callers do not need to read them from the similarity matrix
+        
+    Returns:
+        np.ndarray: Game indices, most similar first
+            (with return_scores: tuple of indices and similarities)
+    """
+    if getattr(similarity_matrix, 'ann_index', None) is None:
+        n_probe = None
+    mask_key = None
+    if mask is not None:
+        mask = np.asarray(mask, dtype=np.bool_)
+        mask_key = hashlib.sha1(np.packbits(mask).tobytes()).digest()
+    key = (selected_index, mask_key, n_probe)
+    
+    with _top_k_lock:
+        entry = _top_k_cache.get(key)
+        if entry is not None and entry[0] is similarity_matrix and (len(entry[1]) >= k or entry[3]):
+            _top_k_cache.move_to_end(key)
+            _, ranked, scores, _ = entry
+        else:
+            depth = max(k, _TOP_K_MIN_DEPTH)
+            if n_probe is not None:
+                ranked, scores = similarity_matrix.search(selected_index, depth, n_probe=n_probe, mask=mask)
+                complete = len(ranked) < depth
+            else:
+                ranked, scores, complete = _rank_similar(similarity_matrix[selected_index], selected_index, depth, mask)
+            _top_k_cache[key] = (similarity_matrix, ranked, scores, complete)
+            _top_k_cache.move_to_end(key)
+            while len(_top_k_cache) > _TOP_K_CACHE_SIZE:
+                _top_k_cache.popitem(last=False)
+    
+    count = min(k, len(ranked))
+    if threshold is not None:
+        # Scores are descending: count those >= threshold
+        count = min(count, int(np.searchsorted(-scores, -threshold, side='right')))
+    if return_scores:
+        return ranked[:count], scores[:count]
+    return ranked[:count]
+
 # Get similar games
 def get_similar_indices(
     selected_index: int,
     similarity_matrix: np.ndarray,
     top_n: int,
-    similarity_threshold: float = 0.0
-) -> np.ndarray:
+    similarity_threshold: float = 0.0,
+    mask: Optional[np.ndarray] = None,
+    n_probe: Optional[int] = None,
+    return_scores: bool = False
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     """Function to get indices of games with high similarity
     
     Args:
@@ -399,23 +540,20 @@ def get_similar_indices(
         similarity_matrix (np.ndarray): Similarity matrix
         top_n (int): Number of games to get
         similarity_threshold (float, optional): Similarity threshold. Default is 0.0.
+        mask (Optional[np.ndarray], optional): Boolean mask of games that may be returned
+        n_probe (Optional[int], optional): ANN lists to probe (recall / latency knob);
+            exact search when None or when no ANN index is loaded
+        return_scores (bool, optional): Also return the similarities of the games
         
     Returns:
         np.ndarray: Array of similar game indices
+            (with return_scores: tuple of indices and similarities)
     """
-    # Similarity excluding self
-    similarities = similarity_matrix[selected_index]
-    mask = (similarities >= similarity_threshold) & (np.arange(len(similarities)) != selected_index)
-    
-    # Extract indices that exceed threshold and sort by similarity
-    filtered_indices = np.where(mask)[0]
-    if filtered_indices.size == 0:
-        return np.array([])
-        
-    sorted_indices = filtered_indices[np.argsort(similarities[filtered_indices])[::-1]]
-    
-    # Limit to top_n
-    return sorted_indices[:min(top_n, len(sorted_indices))]
+    # Similarity excluding self, limited to top_n above the threshold
+    return top_k_similar(
+        selected_index, similarity_matrix, top_n,
+        mask=mask, threshold=similarity_threshold, n_probe=n_probe, return_scores=return_scores
+    )
 
 # Function to analyze similarity reasons
 def analyze_similarity_reasons(
@@ -535,7 +673,7 @@ def generate_heatmap(
         Optional[io.BytesIO]: Heatmap image buffer, None on error
     """
     try:
-        similar_indices = np.argsort(similarity_matrix[selected_index])[::-1][1:top_n+1]
+        similar_indices = top_k_similar(selected_index, similarity_matrix, top_n)
         all_indices = [selected_index] + list(similar_indices)
         
         # Create subset of similarity matrix
@@ -599,7 +737,8 @@ def analyze_distribution_data(
     games: List[Dict[str, Any]],
     game_data_list: List[Dict[str, Any]],
     similarity_matrix: np.ndarray,
-    top_n: int = 20
+    top_n: int = 20,
+    game_table: Optional[GameTable] = None
 ) -> Tuple[pd.DataFrame, Counter, Counter]:
     """Function to analyze similar game distribution data
     
@@ -609,13 +748,14 @@ def analyze_distribution_data(
         game_data_list (List[Dict[str, Any]]): List of game data
         similarity_matrix (np.ndarray): Similarity matrix
         top_n (int, optional): Number of games to analyze. Default is 20.
+        game_table (Optional[GameTable], optional): Columnar view of game_data_list,
+            used to count categories and mechanics with sparse row sums
         
     Returns:
         Tuple[pd.DataFrame, Counter, Counter]: Similarity dataframe, category distribution, mechanics distribution
     """
     # Get high similarity games
-    similarities = similarity_matrix[selected_index]
-    indices = np.argsort(similarities)[::-1][1:top_n+1]
+    indices, similarities = top_k_similar(selected_index, similarity_matrix, top_n, return_scores=True)
     
     # Create DataFrame with language-aware names
     display_names = []
@@ -624,10 +764,13 @@ def analyze_distribution_data(
     
     df = pd.DataFrame({
         t('common.game_name'): display_names,
-        t('common.similarity'): [similarities[i] for i in indices]
+        t('common.similarity'): similarities
     })
     
-    # Analyze category and mechanics distribution
+    # Analyze category and mechanics distribution (top 10 games only)
+    if game_table is not None:
+        return df, game_table.category_counts(indices[:10]), game_table.mechanic_counts(indices[:10])
+    
     all_categories = []
     all_mechanics = []
     
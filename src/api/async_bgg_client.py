@@ -0,0 +1,252 @@
+"""
+Asynchronous BGG API client.
+
+Keeps several BGG requests in flight while drawing on the same rate limiter
+schedule as the synchronous client, so callers such as daily_update.py can overlap
+network waits with YAML writing and learning curve calculation.
+HTTP calls reuse the shared pooled session and run in worker threads.
+"""
+
+import asyncio
+import random
+import logging
+import requests
+from collections import deque
+
+from src.api.http_transport import bgg_get, cached_response
+from src.api.rate_limiter import RateLimiter
+from src.api.bgg_parser import parse_search_results, parse_thing_items
+from src.api.poll_queue import PollQueue, QUEUED, QUEUED_STATUS
+from src.api.bgg_api import (
+    get_game_details as _cached_get_game_details,
+    _get_bgg_headers,
+    _normalize_game_id,
+    _search_url,
+    _thing_url,
+)
+
+_logger = logging.getLogger(__name__)
+
+class AsyncBGGClient:
+    """Coroutine-based BGG client with bounded concurrency"""
+
+    def __init__(self, max_per_minute=15, max_concurrency=4, chunk_size=20, max_retries=3, revalidate=False):
+        """
+        Parameters:
+        max_per_minute (int): Maximum number of requests per minute
+        max_concurrency (int): Maximum number of requests in flight
+        chunk_size (int): Number of IDs per batched thing request
+        max_retries (int): Maximum number of retries on 429 / 5xx / connection errors
+        revalidate (bool): Always ask BGG whether cached responses changed
+            (conditional requests) instead of serving them while fresh
+        """
+        self.limiter = RateLimiter(max_per_minute)
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.revalidate = revalidate
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @staticmethod
+    def _parse_response(response, parse):
+        """Parse the XML body of a response (runs in a worker thread)"""
+        if response.status_code == QUEUED_STATUS:
+            return QUEUED
+        if response.status_code != 200:
+            _logger.error(f"Error: Status code {response.status_code} for {response.url}")
+            return None
+        return parse(response.content)
+
+    def _get_and_parse(self, url, parse):
+        """Send a request and parse the XML body (runs in a worker thread)"""
+        response = bgg_get(url, headers=_get_bgg_headers(), revalidate=self.revalidate)
+        return self._parse_response(response, parse)
+
+    async def _request(self, url, parse):
+        """
+        Rate-limited request with backoff on 429, 5xx and connection errors
+
+        Parameters:
+        url (str): Request URL
+        parse (callable): Function converting the raw XML body into the result
+
+        Returns:
+        Parsed result, QUEUED if BGG answered 202, or None on a non-retryable error status
+        """
+        # Fresh disk cache hits do not consume rate limit budget
+        response = None if self.revalidate else cached_response(url)
+        if response is not None:
+            return await asyncio.to_thread(self._parse_response, response, parse)
+
+        retries = 0
+        while True:
+            try:
+                # Reserve the rate limit slot only once a request may actually start, so the
+                # shared schedule never holds more than max_concurrency slots ahead of time
+                async with self._semaphore:
+                    await self.limiter.acquire_async()
+                    return await asyncio.to_thread(self._get_and_parse, url, parse)
+            except requests.exceptions.HTTPError as e:
+                if retries >= self.max_retries:
+                    raise
+                if e.response.status_code == 429:
+                    wait_time = int(e.response.headers.get('Retry-After', 30)) + random.uniform(1, 5)
+                else:
+                    wait_time = (2 ** (retries + 1)) + random.uniform(0, 1)
+                _logger.warning(f"BGG API status {e.response.status_code}. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{self.max_retries})")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if retries >= self.max_retries:
+                    raise
+                wait_time = (2 ** (retries + 1)) + random.uniform(0, 1)
+                _logger.warning(f"{type(e).__name__} occurred. Retrying in {wait_time:.1f} seconds... (attempt {retries + 1}/{self.max_retries})")
+            retries += 1
+            await asyncio.sleep(wait_time)
+
+    async def get_game_details(self, game_id):
+        """
+        Get detailed game information
+
+        Parameters:
+        game_id (int or str): BoardGameGeek game ID
+
+        Returns:
+        dict: Dictionary containing game details, or None on error
+        """
+        if not self.revalidate:
+            hit, cached = _cached_get_game_details.cache_lookup(game_id)
+            if hit and cached:
+                return cached
+
+        url = _thing_url([game_id])
+        poll_queue = PollQueue()
+        games = await self._request(url, parse_thing_items)
+        while games is QUEUED and poll_queue.park(url):
+            await asyncio.sleep(poll_queue.next_delay())
+            poll_queue.pop_ready()
+            games = await self._request(url, parse_thing_items)
+        if games is None or games is QUEUED:
+            return None
+
+        game = games[0] if games else {}
+        _cached_get_game_details.cache_store(game, game_id)
+        return game
+
+    async def search_games(self, query, exact=False):
+        """
+        Search by game name
+
+        Parameters:
+        query (str): Game name to search
+        exact (bool): Whether to perform exact match search
+
+        Returns:
+        list: List of search results, or None on error
+        """
+        return await self._request(_search_url(query, exact), parse_search_results)
+
+    async def _fetch_chunk(self, chunk):
+        """
+        Fetch one chunk of IDs with a single thing request
+
+        Returns:
+        tuple: (chunk, dict of normalized game ID -> game details, or QUEUED)
+        """
+        try:
+            games = await self._request(_thing_url(chunk), parse_thing_items)
+        except Exception as e:
+            _logger.error(f"Error retrieving game IDs {', '.join(str(g) for g in chunk)}: {e}")
+            games = None
+        
+        if games is QUEUED:
+            return chunk, QUEUED
+
+        games_by_id = {
+            _normalize_game_id(game["id"]): game
+            for game in games or [] if game.get("id")
+        }
+        return chunk, games_by_id
+
+    async def iter_game_details(self, game_ids):
+        """
+        Fetch details for many games, yielding results as each batch completes
+        
+        Chunks BGG answers with 202 (queued) are parked in a poll queue and
+        re-requested with backoff while the other chunks keep being fetched.
+        Only a small window of chunk requests (2 * max_concurrency) exists at
+        a time; the rest are started as earlier ones finish.
+
+        Parameters:
+        game_ids (iterable): BoardGameGeek game IDs
+
+        Yields:
+        tuple: (requested game ID, game details dict or None if not retrieved)
+        """
+        pending = []
+        for game_id in game_ids:
+            hit, cached = (False, None) if self.revalidate else _cached_get_game_details.cache_lookup(game_id)
+            if hit and cached:
+                yield game_id, cached
+            elif game_id not in pending:
+                pending.append(game_id)
+
+        chunks = deque(
+            tuple(pending[start:start + self.chunk_size])
+            for start in range(0, len(pending), self.chunk_size)
+        )
+        window = 2 * self.max_concurrency
+        tasks = set()
+        poll_queue = PollQueue()
+        
+        def start_chunks():
+            while chunks and len(tasks) < window:
+                tasks.add(asyncio.ensure_future(self._fetch_chunk(chunks.popleft())))
+        
+        try:
+            start_chunks()
+            while tasks or chunks or poll_queue:
+                if tasks:
+                    # Wake up for whichever comes first: a finished chunk or a parked chunk falling due
+                    done, tasks = await asyncio.wait(
+                        tasks, timeout=poll_queue.next_delay(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                else:
+                    done = set()
+                    await asyncio.sleep(poll_queue.next_delay())
+                
+                # Parked chunks that fell due go ahead of chunks not requested yet
+                chunks.extendleft(reversed(poll_queue.pop_ready()))
+                
+                for task in done:
+                    chunk, games_by_id = task.result()
+                    if games_by_id is QUEUED:
+                        if poll_queue.park(chunk):
+                            continue
+                        games_by_id = {}
+                    poll_queue.done(chunk)
+                    for game_id in chunk:
+                        game = games_by_id.get(_normalize_game_id(game_id))
+                        if game:
+                            _cached_get_game_details.cache_store(game, game_id)
+                        yield game_id, game
+                
+                start_chunks()
+        finally:
+            # Stop outstanding requests if the consumer exits early
+            for task in tasks:
+                task.cancel()
+
+    async def get_game_details_many(self, game_ids):
+        """
+        Get detailed information for several games using batched thing requests
+
+        Parameters:
+        game_ids (iterable): BoardGameGeek game IDs
+
+        Returns:
+        dict: Requested game ID -> game details dict (IDs not returned by BGG are omitted)
+        """
+        results = {}
+        async for game_id, game in self.iter_game_details(game_ids):
+            if game:
+                results[game_id] = game
+        return results
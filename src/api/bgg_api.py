@@ -1,9 +1,12 @@
-import requests
-import xml.etree.ElementTree as ET
 import os
+import time
 import logging
+from collections import deque
 from dotenv import load_dotenv
-from src.api.rate_limiter import rate_limited_request, ttl_cache
+from src.api.rate_limiter import rate_limited_request, single_flight, ttl_cache
+from src.api.http_transport import bgg_get, cached_response
+from src.api.bgg_parser import parse_mechanics, parse_search_results, parse_thing_items
+from src.api.poll_queue import PollQueue, QUEUED, QUEUED_STATUS
 
 try:
     import streamlit as st
@@ -15,6 +18,9 @@ load_dotenv()
 
 _logger = logging.getLogger(__name__)
 
+# Base URL of the BGG XML API (override to point at a mirror or local stand-in server)
+BGG_API_BASE = os.getenv("BGG_API_BASE", "https://boardgamegeek.com/xmlapi2")
+
 def _spinner(msg: str):
     """Return st.spinner if Streamlit is available, else a no-op context manager."""
     if _ST_AVAILABLE:
@@ -43,9 +49,57 @@ def _get_bgg_headers():
     _logger.warning("BGG_TOKEN is not set. Requests will be sent without authorization.")
     return {}
 
+@rate_limited_request(max_per_minute=15)
+def _rate_limited_thing_get(url):
+    """Request a thing URL through the rate limiter"""
+    return bgg_get(url, headers=_get_bgg_headers())
+
+@rate_limited_request(max_per_minute=20)
+def _rate_limited_search_get(url):
+    """Request a search URL through the rate limiter"""
+    return bgg_get(url, headers=_get_bgg_headers())
+
+def _get_response(url, fetch):
+    """
+    Return a fresh response from the disk cache, or fetch it
+    
+    Disk cache hits do not consume rate limit budget.
+    
+    Parameters:
+    url (str): Request URL
+    fetch (callable): Rate-limited fetch function used on a cache miss
+    
+    Returns:
+    requests.Response: Response object
+    """
+    response = cached_response(url)
+    if response is None:
+        response = fetch(url)
+    return response
+
+def _get_response_when_ready(url, fetch, max_attempts=5):
+    """
+    Like _get_response, but re-polls while BGG answers 202 (request queued)
+    
+    Parameters:
+    url (str): Request URL
+    fetch (callable): Rate-limited fetch function used on a cache miss
+    max_attempts (int): Number of 202 responses tolerated before giving up
+    
+    Returns:
+    requests.Response: Last response received
+    """
+    poll_queue = PollQueue(max_attempts=max_attempts)
+    response = _get_response(url, fetch)
+    while response.status_code == QUEUED_STATUS and poll_queue.park(url):
+        time.sleep(poll_queue.next_delay())
+        poll_queue.pop_ready()
+        response = _get_response(url, fetch)
+    return response
+
 # API access functions
 @ttl_cache(ttl_hours=48)
-@rate_limited_request(max_per_minute=15)
+@single_flight
 def get_game_mechanics(game_id):
     """
     Get mechanics (game types) information for specified game ID
@@ -56,30 +110,18 @@ def get_game_mechanics(game_id):
     Returns:
     list: List of game mechanics
     """
-    url = f"https://boardgamegeek.com/xmlapi2/thing?id={game_id}"
+    url = f"{BGG_API_BASE}/thing?id={game_id}"
     with _spinner(f"Retrieving mechanics for game ID {game_id}..."):
-        response = requests.get(url, headers=_get_bgg_headers())
+        response = _get_response_when_ready(url, _rate_limited_thing_get)
     
     if response.status_code == 200:
-        root = ET.fromstring(response.content)
-        mechanics = []
-        
-        # Get all elements with link type "boardgamemechanic"
-        mechanic_elements = root.findall(".//link[@type='boardgamemechanic']")
-        
-        for mechanic in mechanic_elements:
-            mechanics.append({
-                "id": mechanic.get("id"),
-                "name": mechanic.get("value")
-            })
-        
-        return mechanics
+        return parse_mechanics(response.content)
     else:
         _show_error(f"Error: Status code {response.status_code}")
         return None
 
 @ttl_cache(ttl_hours=48)
-@rate_limited_request(max_per_minute=15)
+@single_flight
 def get_game_details(game_id):
     """
     Get detailed game information (name, year, mechanics, categories, etc.)
@@ -90,227 +132,111 @@ def get_game_details(game_id):
     Returns:
     dict: Dictionary containing game details
     """
-    url = f"https://boardgamegeek.com/xmlapi2/thing?id={game_id}&stats=1"
+    url = _thing_url([game_id])
     with _spinner(f"Retrieving detailed information for game ID {game_id}..."):
-        response = requests.get(url, headers=_get_bgg_headers())
+        response = _get_response_when_ready(url, _rate_limited_thing_get)
     
     if response.status_code == 200:
-        root = ET.fromstring(response.content)
-        game = {}
-        
-        item = root.find(".//item")
-        if item is not None:
-            game["id"] = item.get("id")
-            game["type"] = item.get("type")
-            
-            # Get primary name
-            name_element = item.find(".//name[@type='primary']")
-            if name_element is not None:
-                game["name"] = name_element.get("value")
-            
-            # Get alternate names (including Japanese names)
-            alternate_names = []
-            for name_elem in item.findall(".//name"):
-                name_value = name_elem.get("value")
-                name_type = name_elem.get("type")
-                
-                # Skip primary name as already retrieved
-                if name_type == "primary":
-                    continue
-                
-                alternate_names.append(name_value)
-                
-                # Check if language attribute exists
-                if "language" in name_elem.attrib:
-                    lang = name_elem.get("language")
-                    if lang == "ja" or lang == "jp" or lang == "jpn":
-                        game["japanese_name"] = name_value
-            
-            if alternate_names:
-                game["alternate_names"] = alternate_names
-                
-                # If Japanese title not found yet
-                if "japanese_name" not in game:
-                    # Look for strings containing Japanese characters
-                    for alt_name in alternate_names:
-                        # Check for hiragana or katakana (more reliable Japanese detection)
-                        has_japanese = any(
-                            '\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF'
-                            for c in alt_name
-                        )
-                        if has_japanese:
-                            game["japanese_name"] = alt_name
-                            break
-            
-            # Get year published
-            year_element = item.find(".//yearpublished")
-            if year_element is not None:
-                game["year_published"] = year_element.get("value")
-            
-            # Get thumbnail URL
-            thumbnail_element = item.find(".//thumbnail")
-            if thumbnail_element is not None and thumbnail_element.text:
-                game["thumbnail_url"] = thumbnail_element.text
-            
-            # Get publisher's player count settings
-            minplayers_element = item.find(".//minplayers")
-            if minplayers_element is not None:
-                game["publisher_min_players"] = minplayers_element.get("value")
-                
-            maxplayers_element = item.find(".//maxplayers")
-            if maxplayers_element is not None:
-                game["publisher_max_players"] = maxplayers_element.get("value")
-                
-            # Get publisher's playing time
-            playtime_element = item.find(".//playingtime")
-            if playtime_element is not None:
-                game["playing_time"] = playtime_element.get("value")
-                
-            # Get publisher's recommended age
-            age_element = item.find(".//minage")
-            if age_element is not None:
-                game["publisher_min_age"] = age_element.get("value")
-                
-            # Get BGG community's recommended player count
-            poll = item.findall(".//poll[@name='suggested_numplayers']/results")
-            community_players = {"best": [], "recommended": [], "not_recommended": []}
-            
-            for numplayer_result in poll:
-                num_players = numplayer_result.get("numplayers")
-                
-                # Find the most voted recommendation
-                best_votes = 0
-                best_recommendation = "not_recommended"
-                
-                for result in numplayer_result.findall("./result"):
-                    vote_count = int(result.get("numvotes", "0"))
-                    value = result.get("value")
-                    
-                    if vote_count > best_votes:
-                        best_votes = vote_count
-                        best_recommendation = value
-                
-                # Classify player count based on recommendation
-                if best_recommendation == "Best":
-                    community_players["best"].append(num_players)
-                elif best_recommendation == "Recommended":
-                    community_players["recommended"].append(num_players)
-                elif best_recommendation == "Not Recommended":
-                    community_players["not_recommended"].append(num_players)
-            
-            # Set best player count
-            if community_players["best"]:
-                # Sort if can be interpreted as numbers
-                try:
-                    community_players["best"] = sorted(
-                        community_players["best"],
-                        key=lambda x: float(x.replace("+", ""))
-                    )
-                except ValueError:
-                    pass
-                game["community_best_players"] = ", ".join(community_players["best"])
-            
-            if community_players["recommended"]:
-                try:
-                    community_players["recommended"] = sorted(
-                        community_players["recommended"],
-                        key=lambda x: float(x.replace("+", ""))
-                    )
-                except ValueError:
-                    pass
-                game["community_recommended_players"] = ", ".join(
-                    community_players["recommended"]
-                )
-            
-            # Get BGG community's recommended age
-            suggested_age_poll = item.find(".//poll[@name='suggested_playerage']")
-            if suggested_age_poll is not None:
-                age_results = suggested_age_poll.findall("./results/result")
-                best_age_votes = 0
-                community_age = None
-                
-                for age_result in age_results:
-                    vote_count = int(age_result.get("numvotes", "0"))
-                    age_value = age_result.get("value")
-                    
-                    if vote_count > best_age_votes:
-                        best_age_votes = vote_count
-                        community_age = age_value
-                
-                if community_age:
-                    game["community_min_age"] = community_age
-            
-            # Get description
-            description_element = item.find(".//description")
-            if description_element is not None and description_element.text:
-                game["description"] = description_element.text
-            
-            # Get mechanics (game types)
-            mechanics = []
-            for mechanic in item.findall(".//link[@type='boardgamemechanic']"):
-                mechanics.append({
-                    "id": mechanic.get("id"),
-                    "name": mechanic.get("value")
-                })
-            game["mechanics"] = mechanics
-            
-            # Get categories
-            categories = []
-            for category in item.findall(".//link[@type='boardgamecategory']"):
-                categories.append({
-                    "id": category.get("id"),
-                    "name": category.get("value")
-                })
-            game["categories"] = categories
-            
-            # Get designer information
-            designers = []
-            for designer in item.findall(".//link[@type='boardgamedesigner']"):
-                designers.append({
-                    "id": designer.get("id"),
-                    "name": designer.get("value")
-                })
-            game["designers"] = designers
-            
-            # Get publisher information
-            publishers = []
-            for publisher in item.findall(".//link[@type='boardgamepublisher']"):
-                publishers.append({
-                    "id": publisher.get("id"),
-                    "name": publisher.get("value")
-                })
-            game["publishers"] = publishers
-            
-            # Get rating information
-            ratings = item.find(".//ratings")
-            if ratings is not None:
-                avg_rating = ratings.find(".//average")
-                if avg_rating is not None:
-                    game["average_rating"] = avg_rating.get("value")
-                
-                # Get weight (complexity)
-                weight_element = ratings.find(".//averageweight")
-                if weight_element is not None:
-                    game["weight"] = weight_element.get("value")
-                
-                # Ranking information
-                ranks = []
-                for rank in ratings.findall(".//rank"):
-                    if rank.get("value") != "Not Ranked":
-                        ranks.append({
-                            "type": rank.get("name"),
-                            "id": rank.get("id"),
-                            "rank": rank.get("value")
-                        })
-                game["ranks"] = ranks
-        
-        return game
+        games = parse_thing_items(response.content)
+        return games[0] if games else {}
+    else:
+        _show_error(f"Error: Status code {response.status_code}")
+        return None
+
+def _fetch_thing_items(game_ids):
+    """
+    Fetch several games with a single thing request
+    
+    Parameters:
+    game_ids (list): BoardGameGeek game IDs (BGG accepts up to 20 per request)
+    
+    Returns:
+    list: Game details dicts for every item in the response,
+        QUEUED if BGG is still preparing the response, or None on error
+    """
+    url = _thing_url(game_ids)
+    with _spinner(f"Retrieving detailed information for {len(game_ids)} games..."):
+        response = _get_response(url, _rate_limited_thing_get)
+    
+    if response.status_code == 200:
+        return parse_thing_items(response.content)
+    elif response.status_code == QUEUED_STATUS:
+        return QUEUED
     else:
         _show_error(f"Error: Status code {response.status_code}")
         return None
 
+def _thing_url(game_ids):
+    """Build the thing endpoint URL (with stats) for one or more game IDs"""
+    id_list = ",".join(str(game_id) for game_id in game_ids)
+    return f"{BGG_API_BASE}/thing?id={id_list}&stats=1"
+
+def _normalize_game_id(game_id):
+    """Return game ID without zero padding (BGG echoes IDs unpadded)"""
+    return str(game_id).strip().lstrip("0") or "0"
+
+def get_game_details_many(game_ids, chunk_size=20):
+    """
+    Get detailed information for several games using batched thing requests.
+    Each result is also stored in the get_game_details cache under its own ID.
+    Chunks BGG answers with 202 (queued) are parked and polled again later
+    while the remaining chunks are fetched.
+    
+    Parameters:
+    game_ids (iterable): BoardGameGeek game IDs
+    chunk_size (int): Number of IDs per request
+    
+    Returns:
+    dict: Requested game ID -> game details dict (IDs not returned by BGG are omitted)
+    """
+    results = {}
+    pending = []
+    
+    # Serve what we can from the per-ID cache
+    for game_id in game_ids:
+        hit, cached = get_game_details.cache_lookup(game_id)
+        if hit and cached:
+            results[game_id] = cached
+        elif game_id not in pending:
+            pending.append(game_id)
+    
+    work = deque(
+        tuple(pending[start:start + chunk_size])
+        for start in range(0, len(pending), chunk_size)
+    )
+    poll_queue = PollQueue()
+    
+    while work or poll_queue:
+        if not work:
+            # Only queued chunks are left: wait for the earliest one
+            time.sleep(poll_queue.next_delay())
+            work.extend(poll_queue.pop_ready())
+            continue
+        
+        chunk = work.popleft()
+        games = _fetch_thing_items(list(chunk))
+        work.extend(poll_queue.pop_ready())
+        if games is QUEUED:
+            poll_queue.park(chunk)
+            continue
+        poll_queue.done(chunk)
+        if games is None:
+            continue
+        
+        games_by_id = {
+            _normalize_game_id(game["id"]): game
+            for game in games if game.get("id")
+        }
+        for game_id in chunk:
+            game = games_by_id.get(_normalize_game_id(game_id))
+            if game:
+                get_game_details.cache_store(game, game_id)
+                results[game_id] = game
+    
+    return results
+
 @ttl_cache(ttl_hours=24)
-@rate_limited_request(max_per_minute=20)
+@single_flight
 def search_games(query, exact=False):
     """
     Search by game name
@@ -322,37 +248,22 @@ def search_games(query, exact=False):
     Returns:
     list: List of search results
     """
-    # Replace spaces with +
-    query = query.replace(" ", "+")
-    
-    # If exact is 1, perform exact match search
-    exact_param = "1" if exact else "0"
-    url = f"https://boardgamegeek.com/xmlapi2/search?query={query}&type=boardgame&exact={exact_param}"
+    url = _search_url(query, exact)
     
     with _spinner(f"Searching for '{query}'..."):
-        response = requests.get(url, headers=_get_bgg_headers())
+        response = _get_response(url, _rate_limited_search_get)
     
     if response.status_code == 200:
-        root = ET.fromstring(response.content)
-        results = []
-        
-        for item in root.findall(".//item"):
-            game = {
-                "id": item.get("id"),
-                "type": item.get("type")
-            }
-            
-            name = item.find(".//name")
-            if name is not None:
-                game["name"] = name.get("value")
-                
-            year_published = item.find(".//yearpublished")
-            if year_published is not None:
-                game["year_published"] = year_published.get("value")
-                
-            results.append(game)
-            
-        return results
+        return parse_search_results(response.content)
     else:
         _show_error(f"Error: Status code {response.status_code}")
-        return None
\ No newline at end of file
+        return None
+
+def _search_url(query, exact=False):
+    """Build the search endpoint URL for a game name query"""
+    # Replace spaces with +
+    query = query.replace(" ", "+")
+    
+    # If exact is 1, perform exact match search
+    exact_param = "1" if exact else "0"
+    return f"{BGG_API_BASE}/search?query={query}&type=boardgame&exact={exact_param}"
@@ -0,0 +1,303 @@
+"""
+Parsers for BoardGameGeek XML API responses.
+
+UI-independent: turns raw response bytes into plain dicts, so the Streamlit app
+(src/api/bgg_api.py), the async client and daily_update.py share one parser.
+Thing responses may contain several items (batched requests).
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List
+
+# Language codes BGG uses for Japanese alternate names
+_JAPANESE_LANGUAGE_CODES = ("ja", "jp", "jpn")
+
+# Link types collected into lists of {"id", "name"}
+_LINK_KEYS = {
+    "boardgamemechanic": "mechanics",
+    "boardgamecategory": "categories",
+    "boardgamedesigner": "designers",
+    "boardgamepublisher": "publishers",
+}
+
+# Elements whose value attribute is copied as-is (first occurrence wins)
+_VALUE_KEYS = {
+    "yearpublished": "year_published",
+    "minplayers": "publisher_min_players",
+    "maxplayers": "publisher_max_players",
+    "playingtime": "playing_time",
+    "minage": "publisher_min_age",
+}
+
+def parse_thing_items(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse every item of a thing response in a single streaming pass
+    
+    Elements are handled as their end tags arrive and each item is
+    discarded once converted, so no full tree is kept in memory.
+    
+    Parameters:
+    content (bytes): Raw XML body of a thing response
+    
+    Returns:
+    list: Game details dicts, one per item
+    """
+    games = []
+    stack = []
+    root = None
+    state = None
+    
+    for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+        tag = elem.tag
+        
+        if event == "start":
+            if root is None:
+                root = elem
+            stack.append(elem)
+            
+            if tag == "item" and len(stack) == 2:
+                state = _new_item_state(elem)
+            elif state is None:
+                continue
+            elif tag == "poll":
+                if elem.get("name") == "suggested_playerage":
+                    # Only the first age poll counts
+                    state["age_poll_active"] = not state["age_poll_seen"]
+                    state["age_poll_seen"] = True
+            elif tag == "results":
+                state["best_votes"] = 0
+                state["best_value"] = "not_recommended"
+            elif tag == "ratings":
+                # Only the first ratings block counts
+                state["in_ratings"] = not state["has_ratings"]
+                state["has_ratings"] = True
+            continue
+        
+        stack.pop()
+        if state is None:
+            continue
+        
+        if tag == "item" and len(stack) == 1:
+            games.append(_build_game(state))
+            state = None
+            # Drop the finished item from the document
+            root.clear()
+        elif tag == "name":
+            value = elem.get("value")
+            if elem.get("type") == "primary":
+                if "name" not in state["values"]:
+                    state["values"]["name"] = value
+            else:
+                state["alternate_names"].append(value)
+                if elem.get("language") in _JAPANESE_LANGUAGE_CODES:
+                    state["language_japanese_name"] = value
+        elif tag == "link":
+            key = _LINK_KEYS.get(elem.get("type"))
+            if key:
+                state["links"][key].append({
+                    "id": elem.get("id"),
+                    "name": elem.get("value")
+                })
+        elif tag in _VALUE_KEYS:
+            state["values"].setdefault(_VALUE_KEYS[tag], elem.get("value"))
+        elif tag in ("thumbnail", "description"):
+            # First element wins, even if it has no text
+            if tag not in state["texts"]:
+                state["texts"][tag] = elem.text
+        elif tag == "result":
+            _handle_poll_result(state, elem, stack)
+        elif tag == "results":
+            poll = stack[-1]
+            if poll.tag == "poll" and poll.get("name") == "suggested_numplayers":
+                bucket = _PLAYER_RECOMMENDATIONS.get(state["best_value"])
+                if bucket:
+                    state["community_players"][bucket].append(elem.get("numplayers"))
+        elif tag == "poll":
+            if elem.get("name") == "suggested_playerage":
+                state["age_poll_active"] = False
+            elem.clear()
+        elif tag == "ratings":
+            state["in_ratings"] = False
+        elif state["in_ratings"]:
+            if tag == "average":
+                state["ratings"].setdefault("average_rating", elem.get("value"))
+            elif tag == "averageweight":
+                state["ratings"].setdefault("weight", elem.get("value"))
+            elif tag == "rank" and elem.get("value") != "Not Ranked":
+                state["ranks"].append({
+                    "type": elem.get("name"),
+                    "id": elem.get("id"),
+                    "rank": elem.get("value")
+                })
+    
+    return games
+
+# Most-voted poll value -> community player count bucket
+_PLAYER_RECOMMENDATIONS = {
+    "Best": "best",
+    "Recommended": "recommended",
+    "Not Recommended": "not_recommended",
+}
+
+def _new_item_state(item):
+    """Create the per-item accumulator used while streaming"""
+    return {
+        "id": item.get("id"),
+        "type": item.get("type"),
+        "values": {},
+        "texts": {},
+        "alternate_names": [],
+        "language_japanese_name": None,
+        "links": {key: [] for key in _LINK_KEYS.values()},
+        "community_players": {"best": [], "recommended": [], "not_recommended": []},
+        "best_votes": 0,
+        "best_value": "not_recommended",
+        "age_poll_seen": False,
+        "age_poll_active": False,
+        "best_age_votes": 0,
+        "community_age": None,
+        "has_ratings": False,
+        "in_ratings": False,
+        "ratings": {},
+        "ranks": [],
+    }
+
+def _handle_poll_result(state, result, stack):
+    """Track the most voted value of poll results"""
+    if len(stack) < 2 or stack[-1].tag != "results" or stack[-2].tag != "poll":
+        return
+    poll_name = stack[-2].get("name")
+    
+    if poll_name == "suggested_numplayers":
+        vote_count = int(result.get("numvotes", "0"))
+        if vote_count > state["best_votes"]:
+            state["best_votes"] = vote_count
+            state["best_value"] = result.get("value")
+    elif poll_name == "suggested_playerage" and state["age_poll_active"]:
+        vote_count = int(result.get("numvotes", "0"))
+        if vote_count > state["best_age_votes"]:
+            state["best_age_votes"] = vote_count
+            state["community_age"] = result.get("value")
+
+def _sort_player_counts(player_counts):
+    """Sort player counts numerically when possible ("4+" counts as 4)"""
+    try:
+        return sorted(player_counts, key=lambda x: float(x.replace("+", "")))
+    except ValueError:
+        return player_counts
+
+def _build_game(state):
+    """Assemble the game details dict from a finished item state"""
+    game = {"id": state["id"], "type": state["type"]}
+    values = state["values"]
+    
+    if "name" in values:
+        game["name"] = values["name"]
+    
+    # Japanese name from the language attribute of an alternate name
+    if state["language_japanese_name"] is not None:
+        game["japanese_name"] = state["language_japanese_name"]
+    
+    alternate_names = state["alternate_names"]
+    if alternate_names:
+        game["alternate_names"] = alternate_names
+        
+        # If Japanese title not found yet
+        if "japanese_name" not in game:
+            # Look for strings containing Japanese characters
+            for alt_name in alternate_names:
+                # Check for hiragana or katakana (more reliable Japanese detection)
+                has_japanese = any(
+                    '\u3040' <= c <= '\u309F' or '\u30A0' <= c <= '\u30FF'
+                    for c in alt_name
+                )
+                if has_japanese:
+                    game["japanese_name"] = alt_name
+                    break
+    
+    if "year_published" in values:
+        game["year_published"] = values["year_published"]
+    
+    if state["texts"].get("thumbnail"):
+        game["thumbnail_url"] = state["texts"]["thumbnail"]
+    
+    for key in ("publisher_min_players", "publisher_max_players", "playing_time", "publisher_min_age"):
+        if key in values:
+            game[key] = values[key]
+    
+    community_players = state["community_players"]
+    if community_players["best"]:
+        game["community_best_players"] = ", ".join(_sort_player_counts(community_players["best"]))
+    if community_players["recommended"]:
+        game["community_recommended_players"] = ", ".join(
+            _sort_player_counts(community_players["recommended"])
+        )
+    
+    if state["community_age"]:
+        game["community_min_age"] = state["community_age"]
+    
+    if state["texts"].get("description"):
+        game["description"] = state["texts"]["description"]
+    
+    game.update(state["links"])
+    
+    if state["has_ratings"]:
+        ratings = state["ratings"]
+        if "average_rating" in ratings:
+            game["average_rating"] = ratings["average_rating"]
+        if "weight" in ratings:
+            game["weight"] = ratings["weight"]
+        game["ranks"] = state["ranks"]
+    
+    return game
+
+def parse_mechanics(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Extract every mechanic link from a thing response
+    
+    Parameters:
+    content (bytes): Raw XML body of a thing response
+    
+    Returns:
+    list: List of game mechanics
+    """
+    mechanics = []
+    for _, elem in ET.iterparse(io.BytesIO(content)):
+        if elem.tag == "link" and elem.get("type") == "boardgamemechanic":
+            mechanics.append({
+                "id": elem.get("id"),
+                "name": elem.get("value")
+            })
+    return mechanics
+
+def parse_search_results(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Convert a search response into a list of result dicts
+    
+    Parameters:
+    content (bytes): Raw XML body of a search response
+    
+    Returns:
+    list: List of search results
+    """
+    root = ET.fromstring(content)
+    results = []
+    
+    for item in root.findall(".//item"):
+        game = {
+            "id": item.get("id"),
+            "type": item.get("type")
+        }
+        
+        name = item.find(".//name")
+        if name is not None:
+            game["name"] = name.get("value")
+            
+        year_published = item.find(".//yearpublished")
+        if year_published is not None:
+            game["year_published"] = year_published.get("value")
+            
+        results.append(game)
+        
+    return results
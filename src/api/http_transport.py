@@ -0,0 +1,220 @@
+"""
+Shared HTTP transport for BoardGameGeek API calls.
+
+All BGG requests go through one pooled requests.Session per process so that
+TCP/TLS connections are kept alive and reused across calls. The session can be
+replaced with set_session() (e.g. to point tests at a local stand-in server).
+Successful responses are also kept in a persistent on-disk cache
+(see src/api/response_cache.py) and revalidated with conditional requests.
+"""
+
+import os
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from src.api.response_cache import ResponseCache
+
+_logger = logging.getLogger(__name__)
+
+# Timeouts in seconds: (connect, read)
+CONNECT_TIMEOUT = float(os.getenv("BGG_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("BGG_READ_TIMEOUT", "30"))
+
+# Connection pool settings
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+
+# Status codes that are raised as HTTPError so rate_limited_request can back off and retry
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+# Persistent response cache (disable with BGG_DISK_CACHE=0)
+_response_cache = None
+_response_cache_enabled = os.getenv("BGG_DISK_CACHE", "1") != "0"
+
+def create_session(pool_maxsize=POOL_MAXSIZE, connect_retries=2, hooks=None):
+    """
+    Create a requests.Session tuned for BGG API access
+
+    Parameters:
+    pool_maxsize (int): Maximum number of kept-alive connections per host
+    connect_retries (int): Transparent retries for failed connects (e.g. stale keep-alive sockets)
+    hooks (dict, optional): requests event hooks, e.g. {"response": [callback]}
+
+    Returns:
+    requests.Session: Configured session
+    """
+    session = requests.Session()
+
+    # Only connection-level failures are retried here; HTTP status handling
+    # (429 / 5xx backoff) is left to rate_limited_request
+    retry = Retry(
+        total=connect_retries,
+        connect=connect_retries,
+        read=0,
+        status=0,
+        backoff_factor=0.5,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": "boardgame_analyzer",
+    })
+
+    if hooks:
+        for event, callbacks in hooks.items():
+            session.hooks.setdefault(event, []).extend(callbacks)
+
+    return session
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def set_session(session):
+    """
+    Replace the shared session
+
+    Parameters:
+    session (requests.Session or None): Session to use for all BGG calls.
+        None closes the current session; a default one is created on next use.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None and _session is not session:
+            _session.close()
+        _session = session
+
+def get_response_cache():
+    """Return the shared on-disk response cache, or None if disabled"""
+    global _response_cache, _response_cache_enabled
+    if _response_cache is None and _response_cache_enabled:
+        with _session_lock:
+            if _response_cache is None and _response_cache_enabled:
+                try:
+                    _response_cache = ResponseCache()
+                except Exception as e:
+                    _logger.warning(f"Disk response cache unavailable: {e}")
+                    _response_cache_enabled = False
+    return _response_cache
+
+def set_response_cache(cache):
+    """
+    Replace the shared response cache
+
+    Parameters:
+    cache (ResponseCache or None): Cache to use, or None to disable disk caching
+    """
+    global _response_cache, _response_cache_enabled
+    with _session_lock:
+        _response_cache = cache
+        _response_cache_enabled = cache is not None
+
+def _response_from_cache(entry):
+    """Build a requests.Response from a cache entry"""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = entry.body
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response.url = entry.url
+    response.from_cache = True
+    return response
+
+def cached_response(url):
+    """
+    Return a fresh cached response without contacting the server
+
+    Parameters:
+    url (str): Request URL
+
+    Returns:
+    requests.Response or None: Cached response, or None if missing or stale
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    try:
+        entry = cache.get(url)
+    except Exception as e:
+        _logger.warning(f"Disk response cache read failed: {e}")
+        return None
+    if entry is not None and cache.is_fresh(entry):
+        return _response_from_cache(entry)
+    return None
+
+def bgg_get(url, headers=None, timeout=None, revalidate=False):
+    """
+    Send a GET request to the BGG API through the shared session
+
+    Fresh disk-cached responses are returned directly. Stale entries are
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reply is
+    answered from the cache.
+
+    Parameters:
+    url (str): Request URL
+    headers (dict, optional): Extra request headers (e.g. Authorization)
+    timeout (tuple, optional): (connect, read) timeout in seconds
+    revalidate (bool): Revalidate cached entries even while they are fresh
+
+    Returns:
+    requests.Response: Response object
+
+    Raises:
+    requests.exceptions.HTTPError: For 429 and 5xx responses, so callers
+        decorated with rate_limited_request back off and retry
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    cache = get_response_cache()
+    entry = None
+    if cache is not None:
+        try:
+            entry = cache.get(url)
+        except Exception as e:
+            _logger.warning(f"Disk response cache read failed: {e}")
+        if entry is not None and not revalidate and cache.is_fresh(entry):
+            return _response_from_cache(entry)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+
+    response = get_session().get(url, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(url)
+        return _response_from_cache(entry)
+
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        _logger.warning(f"BGG API returned status {response.status_code} for {url}")
+        response.raise_for_status()
+
+    # Only complete responses are cached (202 "queued" replies are not)
+    if response.status_code == 200 and cache is not None:
+        try:
+            cache.put(url, response.content, response.headers)
+        except Exception as e:
+            _logger.warning(f"Disk response cache write failed: {e}")
+
+    return response
@@ -0,0 +1,100 @@
+"""
+Deferred retry queue for BGG "queued" responses.
+
+BGG answers HTTP 202 Accepted while it is still preparing a response; the same
+request returns 200 once the data is ready. Requests that got a 202 are parked
+here with exponential backoff, so callers can keep fetching other IDs and come
+back to the parked ones when they are due.
+"""
+
+import time
+import heapq
+import random
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# HTTP status BGG uses for "request accepted, come back later"
+QUEUED_STATUS = 202
+
+class _Queued:
+    """Marker returned instead of a parsed result when BGG answered 202"""
+
+    def __repr__(self):
+        return "QUEUED"
+
+QUEUED = _Queued()
+
+class PollQueue:
+    """Min-heap of parked requests ordered by the time they should be polled again"""
+
+    def __init__(self, base_delay=2.0, max_delay=30.0, max_attempts=10):
+        """
+        Parameters:
+        base_delay (float): Wait before the first re-poll (seconds)
+        max_delay (float): Upper bound for the backoff between re-polls (seconds)
+        max_attempts (int): Number of 202 responses tolerated per item before giving up
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._heap = []
+        self._attempts = {}
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def park(self, item):
+        """
+        Schedule a re-poll for an item that got a 202 response
+
+        Parameters:
+        item (hashable): Request to retry (e.g. a tuple of game IDs)
+
+        Returns:
+        bool: True if the item was parked, False if it exceeded max_attempts
+        """
+        attempt = self._attempts.get(item, 0) + 1
+        if attempt > self.max_attempts:
+            _logger.error(f"BGG still queued after {self.max_attempts} polls, giving up: {item}")
+            self._attempts.pop(item, None)
+            return False
+        self._attempts[item] = attempt
+
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay += random.uniform(0, delay * 0.1)
+        _logger.info(f"BGG queued the request, polling again in {delay:.1f} seconds (attempt {attempt}/{self.max_attempts}): {item}")
+
+        # The counter keeps heap order stable and avoids comparing items
+        self._counter += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, item))
+        return True
+
+    def pop_ready(self):
+        """
+        Remove and return every item whose re-poll time has come
+
+        Returns:
+        list: Items due for a re-poll, earliest first
+        """
+        now = time.monotonic()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap)[2])
+        return ready
+
+    def next_delay(self):
+        """
+        Seconds until the next parked item is due
+
+        Returns:
+        float or None: 0 if an item is already due, None if the queue is empty
+        """
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def done(self, item):
+        """Forget the attempt count of an item that finally returned a result"""
+        self._attempts.pop(item, None)
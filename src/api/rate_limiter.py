@@ -1,8 +1,17 @@
+import os
+import sys
+import json
 import time
+import hashlib
 import random
+import asyncio
+import sqlite3
+import logging
+import threading
 import requests
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
 from functools import wraps
-from datetime import datetime, timedelta
 
 try:
     import streamlit as st
@@ -10,8 +19,17 @@ try:
 except ImportError:
     _STREAMLIT_AVAILABLE = False
 
-# Global variable to store API request history
-request_history = []
+_logger = logging.getLogger(__name__)
+
+# Limiter state shared by all processes on this machine (Streamlit sessions and
+# the cron job); set BGG_RATE_LIMIT_SHARED=0 to keep the state per process
+RATE_LIMIT_STATE_PATH = os.getenv("BGG_RATE_LIMIT_PATH", os.path.join("cache", "bgg_rate_limit.sqlite3"))
+_rate_limit_shared = os.getenv("BGG_RATE_LIMIT_SHARED", "1") != "0"
+
+# In-process limiter state: key -> theoretical arrival time (epoch seconds)
+_local_tat: dict = {}
+_local_lock = threading.Lock()
+_state_store = None
 
 def _spinner(msg: str):
     """Return st.spinner context manager if Streamlit is available, else a no-op."""
@@ -31,6 +49,145 @@ def _show_error(msg: str):
     else:
         print(f"[ERROR] {msg}")
 
+class _SQLiteLimiterState:
+    """Theoretical arrival times kept in SQLite so several processes share one budget"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS limiter (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+            )
+
+    def update(self, key, advance):
+        """
+        Atomically read and advance the arrival time for key
+
+        Parameters:
+        key (str): Limiter key
+        advance (callable): Maps the stored arrival time to (new arrival time, result)
+
+        Returns:
+        The result returned by advance
+        """
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock, so read-modify-write is atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tat FROM limiter WHERE key = ?", (key,)).fetchone()
+                tat, result = advance(row[0] if row else 0.0)
+                self._conn.execute("INSERT OR REPLACE INTO limiter (key, tat) VALUES (?, ?)", (key, tat))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+def _get_state_store():
+    """Return the shared SQLite limiter state, or None if sharing is disabled or unavailable"""
+    global _state_store, _rate_limit_shared
+    if _state_store is None and _rate_limit_shared:
+        with _local_lock:
+            if _state_store is None and _rate_limit_shared:
+                try:
+                    _state_store = _SQLiteLimiterState(RATE_LIMIT_STATE_PATH)
+                except Exception as e:
+                    _logger.warning(f"Shared rate limiter state unavailable, limiting per process: {e}")
+                    _rate_limit_shared = False
+    return _state_store
+
+class RateLimiter:
+    """
+    Thread-safe rate limiter using the generic cell rate algorithm (GCRA)
+
+    Each request reserves the next free slot on a shared "theoretical arrival
+    time", so waiters are served in order and the per-minute cap holds under
+    any number of threads, coroutines or processes. Limiters with the same key
+    share one schedule; each advances it by its own interval (60 / max_per_minute).
+    A request may cost several units (e.g. the tokens of an API call), which
+    advances the schedule by that many intervals.
+    """
+
+    def __init__(self, max_per_minute=15, burst=1, key="bgg", shared=None):
+        """
+        Parameters:
+        max_per_minute (int): Sustained number of requests allowed per minute
+        burst (int): Number of requests that may be sent back-to-back
+        key (str): Schedule shared with other limiters using the same key
+        shared (bool, optional): Share the schedule across processes through SQLite
+            (default: BGG_RATE_LIMIT_SHARED, enabled unless set to 0)
+        """
+        self.interval = 60.0 / max_per_minute
+        self.tolerance = (burst - 1) * self.interval
+        self.key = key
+        self.shared = _rate_limit_shared if shared is None else shared
+
+    def _advance(self, tat, cost=1):
+        """Reserve the next slot: return (new arrival time, seconds to wait)"""
+        now = time.time()
+        tat = max(tat, now)
+        wait = max(0.0, tat - self.tolerance - now)
+        return tat + self.interval * cost, wait
+
+    def reserve(self, cost=1):
+        """
+        Reserve a request slot without sleeping
+
+        Parameters:
+        cost (float): Units the request uses up (1 for plain request counting)
+
+        Returns:
+        float: Seconds the caller must wait before sending the request
+        """
+        advance = lambda tat: self._advance(tat, cost)
+        store = _get_state_store() if self.shared else None
+        if store is not None:
+            try:
+                return store.update(self.key, advance)
+            except sqlite3.Error as e:
+                _logger.warning(f"Shared rate limiter state failed, limiting per process: {e}")
+
+        with _local_lock:
+            _local_tat[self.key], wait = advance(_local_tat.get(self.key, 0.0))
+        return wait
+
+    def acquire(self, cost=1):
+        """
+        Block until a request may be sent
+
+        Parameters:
+        cost (float): Units the request uses up
+
+        Returns:
+        float: Seconds waited
+        """
+        wait = self.reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, cost=1):
+        """
+        Wait in a coroutine until a request may be sent
+
+        Parameters:
+        cost (float): Units the request uses up
+
+        Returns:
+        float: Seconds waited
+        """
+        # SQLite access may block briefly on another process's lock
+        wait = await asyncio.to_thread(self.reserve, cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
 def rate_limited_request(max_per_minute=30, max_retries=3):
     """
     Decorator to rate-limit BGG API requests
@@ -42,41 +199,23 @@ def rate_limited_request(max_per_minute=30, max_retries=3):
     Returns:
     function: Decorated function
     """
-    # Calculate minimum interval between requests
-    min_interval = 60.0 / max_per_minute
+    # All decorated functions share the "bgg" schedule, each at its own interval
+    limiter = RateLimiter(max_per_minute)
     
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            global request_history
-            
-            # Remove request history older than 1 minute
-            current_time = time.time()
-            one_minute_ago = current_time - 60
-            request_history = [t for t in request_history if t > one_minute_ago]
-            
-            # Check number of requests in the past minute
-            if len(request_history) >= max_per_minute:
-                # Use min_interval to distribute requests evenly
-                oldest_request = min(request_history) if request_history else current_time - 60
-                time_since_oldest = current_time - oldest_request
-                # Calculate wait time based on elapsed time
-                wait_time = max(0, min_interval - (time_since_oldest / max(1, len(request_history)))) + random.uniform(0.1, 1.0)
-                
-                if wait_time > 0:
-                    with _spinner(f"BGG API rate limit reached. Waiting {wait_time:.1f} seconds..."):
-                        time.sleep(wait_time)
-            
-            # Add jitter to avoid simultaneous requests
-            jitter = random.uniform(0.2, 1.0)
-            time.sleep(jitter)
-            
             # Execute request with retry logic
             retries = 0
             while retries <= max_retries:
                 try:
-                    # Record request history
-                    request_history.append(time.time())
+                    # Wait for a slot in the shared schedule
+                    wait_time = limiter.reserve()
+                    if wait_time > 1:
+                        with _spinner(f"BGG API rate limit reached. Waiting {wait_time:.1f} seconds..."):
+                            time.sleep(wait_time)
+                    elif wait_time > 0:
+                        time.sleep(wait_time)
                     
                     # Actual function call
                     result = func(*args, **kwargs)
@@ -122,13 +261,164 @@ def rate_limited_request(max_per_minute=30, max_retries=3):
         return wrapper
     return decorator
 
-# In-memory cache store (Streamlit-independent)
-_memory_cache: dict = {}
+# Limits for the in-memory API result cache
+MEMORY_CACHE_MAX_ENTRIES = 4096
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_CACHE_SWEEP_SECONDS = 600
+
+def _approx_size(value):
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_approx_size(v) for v in value)
+    return sys.getsizeof(value)
+
+def make_cache_key(func, args, kwargs):
+    """
+    Deterministic cache key for a function call
+    
+    The key is a SHA-1 of the canonical JSON form of the qualified function name
+    and its arguments, so it is stable across processes and can be persisted.
+    
+    Parameters:
+    func (callable): Cached function
+    args (tuple): Positional arguments
+    kwargs (dict): Keyword arguments
+    
+    Returns:
+    str: Hex digest
+    """
+    payload = json.dumps(
+        [f"{func.__module__}.{func.__qualname__}", list(args), sorted(kwargs.items())],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=repr
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class BoundedTTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and entry / byte limits
+    
+    Least recently used entries are evicted when either limit is exceeded, and
+    expired entries are swept out periodically, so memory stays flat in a
+    long-running Streamlit server.
+    """
+    
+    def __init__(self, max_entries=MEMORY_CACHE_MAX_ENTRIES, max_bytes=MEMORY_CACHE_MAX_BYTES,
+                 sweep_interval=MEMORY_CACHE_SWEEP_SECONDS):
+        """
+        Parameters:
+        max_entries (int): Maximum number of entries
+        max_bytes (int): Maximum approximate total size of cached values
+        sweep_interval (float): Seconds between sweeps for expired entries
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        # key -> (value, expires_at, size); order is least to most recently used
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _sweep(self, now):
+        """Drop all expired entries (caller holds the lock)"""
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        self._next_sweep = now + self.sweep_interval
+    
+    def get(self, key):
+        """
+        Look up an entry
+        
+        Returns:
+        tuple: (hit flag, cached value or None)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[0]
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+    
+    def set(self, key, value, ttl_seconds):
+        """
+        Store an entry, evicting least recently used entries if over a limit
+        
+        Parameters:
+        key (str): Cache key
+        value: Value to cache
+        ttl_seconds (float): Time to live
+        """
+        size = _approx_size(value)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Larger than the whole cache; do not store it
+                return
+            self._entries[key] = (value, now + ttl_seconds, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        """
+        Cache statistics
+        
+        Returns:
+        dict: Entry count, approximate bytes, and hit / miss / eviction / expiration counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# In-memory cache store (Streamlit-independent), shared by all ttl_cache functions
+_memory_cache = BoundedTTLCache()
+
+def get_cache_stats():
+    """Return statistics of the in-memory API result cache"""
+    return _memory_cache.stats()
 
 def ttl_cache(ttl_hours=24):
     """
     Decorator to implement Time-to-Live (TTL) cache.
-    Uses an in-memory dictionary instead of st.session_state
+    Uses a bounded in-memory LRU cache instead of st.session_state
     so it works in both Streamlit and CLI environments.
     
     Parameters:
@@ -137,31 +427,104 @@ def ttl_cache(ttl_hours=24):
     Returns:
     function: Decorated function
     """
+    ttl_seconds = ttl_hours * 3600
+    
     def decorator(func):
-        def make_key(args, kwargs):
-            key = str(args) + str(sorted(kwargs.items()))
-            return hash(key)
-        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = f"bgg_cache_{func.__name__}_{make_key(args, kwargs)}"
-            current_time = datetime.now()
+            cache_key = make_cache_key(func, args, kwargs)
             
             # Check if cached value exists and is still valid
-            if cache_key in _memory_cache:
-                value, expires_at = _memory_cache[cache_key]
-                if current_time < expires_at:
-                    return value
-                # Expired — remove from cache
-                del _memory_cache[cache_key]
+            hit, value = _memory_cache.get(cache_key)
+            if hit:
+                return value
             
             # Execute function and store result
             result = func(*args, **kwargs)
-            _memory_cache[cache_key] = (result, current_time + timedelta(hours=ttl_hours))
+            _memory_cache.set(cache_key, result, ttl_seconds)
             return result
         
+        def cache_lookup(*args, **kwargs):
+            """
+            Look up a cached result without calling the function
+            
+            Returns:
+            tuple: (hit flag, cached value or None)
+            """
+            return _memory_cache.get(make_cache_key(func, args, kwargs))
+        
+        def cache_store(value, *args, **kwargs):
+            """Store a value as the cached result for the given call arguments"""
+            _memory_cache.set(make_cache_key(func, args, kwargs), value, ttl_seconds)
+        
+        # Allow batch fetchers to read and fill the per-call cache entries
+        wrapper.cache_lookup = cache_lookup
+        wrapper.cache_store = cache_store
         return wrapper
     return decorator
 
+# Calls currently in flight: cache key -> Future shared by all concurrent callers
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
+
+def single_flight(func):
+    """
+    Decorator to coalesce concurrent identical calls
+    
+    While a call with given arguments is running, other threads calling the
+    function with the same arguments wait for it and receive the same result
+    (or exception) instead of sending their own request. Place it under
+    ttl_cache so only cache misses are coalesced.
+    
+    Only ``Exception``s are shared. If the running call is interrupted by a
+    BaseException (KeyboardInterrupt, SystemExit, ...), that belongs to its own
+    thread: the waiters are released and make the call themselves.
+    
+    Parameters:
+    func (callable): Function to wrap
+    
+    Returns:
+    function: Decorated function
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_cache_key(func, args, kwargs)
+        while True:
+            with _inflight_lock:
+                future = _inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    _inflight[key] = future
+            
+            if leader:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                # The leader was interrupted: retry (as the new leader or a waiter of one)
+                continue
+        
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            _finish_flight(key)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Released waiters must not find this future again when they retry
+            _finish_flight(key)
+            future.cancel()
+            raise
+        _finish_flight(key)
+        future.set_result(result)
+        return result
+    return wrapper
+
+def _finish_flight(key):
+    """Remove a finished call so later callers start a new one"""
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
 # NOTE: search_games_improved / get_game_details_improved はダミー実装のため削除済み。
 # 実装は src/api/bgg_api.py の search_games / get_game_details を使用すること。
\ No newline at end of file
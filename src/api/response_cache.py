@@ -0,0 +1,141 @@
+"""
+Persistent on-disk cache for raw BGG API responses.
+
+Responses are stored in a SQLite database keyed on the normalized request URL,
+so cache entries survive Streamlit restarts and are shared with the daily cron
+job. Stale entries are revalidated with If-None-Match / If-Modified-Since when
+the server supplied an ETag or Last-Modified header.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+_logger = logging.getLogger(__name__)
+
+# Default database location and freshness window
+DEFAULT_CACHE_PATH = os.getenv("BGG_CACHE_PATH", os.path.join("cache", "bgg_responses.sqlite3"))
+DEFAULT_MAX_AGE_HOURS = float(os.getenv("BGG_CACHE_MAX_AGE_HOURS", "12"))
+
+# Entries not refreshed for this long are deleted when the cache is opened
+PURGE_AFTER_DAYS = 30
+
+# Response headers kept alongside the body
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+
+def normalize_url(url):
+    """
+    Normalize a URL so equivalent requests share one cache entry
+
+    Lower-cases scheme and host, sorts query parameters and drops fragments.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+class CachedResponse:
+    """A response body stored in the cache"""
+
+    def __init__(self, url, body, headers, fetched_at):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.fetched_at = fetched_at
+
+    def age_seconds(self):
+        """Seconds since the body was fetched or last revalidated"""
+        return time.time() - self.fetched_at
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+class ResponseCache:
+    """SQLite-backed response cache, safe to share between threads and processes"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_hours=DEFAULT_MAX_AGE_HOURS):
+        """
+        Parameters:
+        path (str): SQLite database file
+        max_age_hours (float): Entries younger than this are served without revalidation
+        """
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets the Streamlit app and the cron job read while the other writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, body BLOB NOT NULL, "
+                "headers TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE fetched_at < ?",
+                (time.time() - PURGE_AFTER_DAYS * 86400,)
+            )
+
+    def get(self, url):
+        """
+        Look up a cached response
+
+        Returns:
+        CachedResponse or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, fetched_at FROM responses WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        body, headers, fetched_at = row
+        return CachedResponse(url, bytes(body), json.loads(headers), fetched_at)
+
+    def is_fresh(self, entry):
+        """Whether an entry can be served without contacting the server"""
+        return entry.age_seconds() < self.max_age_seconds
+
+    def put(self, url, body, headers):
+        """
+        Store a response body
+
+        Parameters:
+        url (str): Request URL
+        body (bytes): Decoded response body
+        headers (Mapping): Response headers
+        """
+        stored = {name: headers[name] for name in _STORED_HEADERS if name in headers}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, headers, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_url(url), sqlite3.Binary(body), json.dumps(stored), time.time())
+            )
+
+    def touch(self, url):
+        """Mark an entry as just revalidated (after a 304 response)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ? WHERE url = ?",
+                (time.time(), normalize_url(url))
+            )
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
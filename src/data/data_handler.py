@@ -1,10 +1,12 @@
 import os
 import logging
-import yaml
+import pickle
 import pandas as pd
 import re
 from datetime import date as _date
 from pathlib import Path
+from src.data.yaml_io import load_yaml, dump_yaml_file, iter_game_files, atomic_write
+from src.data.game_index import load_game_index, record_game_file
 from src.utils.language import t, get_game_display_name, get_game_filename, get_dataframe_column_names
 from src.api.gemini_translator import translate_description
 
@@ -16,6 +18,12 @@ except ImportError:
 
 _logger = logging.getLogger(__name__)
 
+GAME_DATA_DIR = "game_data"
+
+# Compiled catalogue of parsed YAML files (rebuilt incrementally, see load_game_catalog)
+CATALOG_PATH = os.path.join(GAME_DATA_DIR, ".catalog.pickle")
+_CATALOG_VERSION = 1
+
 def _warn(msg: str):
     """Show warning via logger and optionally st.warning if Streamlit is available."""
     _logger.warning(msg)
@@ -189,9 +197,9 @@ def save_game_data_to_yaml(game_data, custom_filename=None, previous_data=None):
             elif existing_history:
                 game_data_safe['update_history'] = existing_history
 
-        # Convert to YAML and save
-        with open(file_path, 'w', encoding='utf-8') as file:
-            yaml.dump(game_data_safe, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        # Convert to YAML and save (atomically, so readers never see a partial file)
+        dump_yaml_file(game_data_safe, file_path)
+        record_game_file(file_path, game_data_safe)
         
         return True, file_path, None
     except Exception as e:
@@ -209,7 +217,7 @@ def load_game_data_from_yaml(file_path):
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            game_data = yaml.safe_load(file)
+            game_data = load_yaml(file)
         return game_data
     except Exception as e:
         _warn(t("errors.file_read", error=str(e)))
@@ -250,6 +258,98 @@ def search_results_to_dataframe(results):
     
     return df
 
+def _read_catalog():
+    """Read the compiled catalogue, returning {} if it is missing, outdated or unreadable"""
+    try:
+        with open(CATALOG_PATH, 'rb') as file:
+            catalog = pickle.load(file)
+        if isinstance(catalog, dict) and catalog.get("version") == _CATALOG_VERSION:
+            return catalog["entries"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _logger.warning(f"Ignoring unreadable game catalogue {CATALOG_PATH}: {e}")
+    return {}
+
+def _write_catalog(entries):
+    """Write the compiled catalogue atomically (readers never see a partial file)"""
+    try:
+        with atomic_write(CATALOG_PATH, binary=True) as file:
+            pickle.dump({"version": _CATALOG_VERSION, "entries": entries}, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        _logger.warning(f"Could not write game catalogue {CATALOG_PATH}: {e}")
+
+def game_data_signature():
+    """
+    Names, modification times and sizes of the YAML files in game_data folder
+    
+    Returns:
+    tuple: Sorted (filename, mtime_ns, size) tuples; changes whenever any file does
+    """
+    if not os.path.isdir(GAME_DATA_DIR):
+        return ()
+    entries = []
+    with os.scandir(GAME_DATA_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".yaml"):
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+def load_game_catalog(parallel=0):
+    """
+    Load every YAML file in game_data folder through the compiled catalogue
+    
+    The catalogue (game_data/.catalog.pickle) holds the parsed contents of each
+    YAML file together with its modification time and size. Only files whose
+    mtime or size changed are parsed again; the YAML files stay the source of truth.
+    
+    Changed files are parsed in this process by default: this runs inside the
+    Streamlit server, whose threads must not be forked into a process pool.
+    
+    Parameters:
+    parallel (int, optional): Worker processes for parsing changed files (see iter_game_files);
+        only pass None or a count from command line tools
+    
+    Returns:
+    dict: Dictionary with filename as key and game data as value (directory listing order)
+    """
+    if not os.path.exists(GAME_DATA_DIR):
+        return {}
+    
+    cached = _read_catalog()
+    entries = {}
+    stale = {}
+    changed = False
+    
+    with os.scandir(GAME_DATA_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".yaml"):
+                continue
+            stat = entry.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            hit = cached.get(entry.name)
+            # Placeholder keeps directory listing order for files parsed below
+            entries[entry.name] = hit
+            if hit is None or hit[0] != signature:
+                stale[entry.path] = signature
+    
+    # Parse new or modified files (unreadable files are retried next time)
+    for file_path, game_data, error in iter_game_files(stale, parallel=parallel):
+        filename = os.path.basename(file_path)
+        if error:
+            _warn(t("errors.file_read", error=error))
+        if game_data:
+            entries[filename] = (stale[file_path], game_data)
+            changed = True
+        else:
+            del entries[filename]
+    
+    if changed or len(entries) != len(cached):
+        _write_catalog(entries)
+    
+    return {filename: game_data for filename, (_, game_data) in entries.items()}
+
 def load_all_game_data():
     """
     Load all game data from YAML files in game_data folder
@@ -259,23 +359,11 @@ def load_all_game_data():
     """
     game_data_dict = {}
     
-    # Check if game_data folder exists
-    if not os.path.exists("game_data"):
-        return game_data_dict
-    
-    # Search for YAML files
-    for filename in os.listdir("game_data"):
-        if filename.endswith(".yaml"):
-            # Extract game ID from filename (e.g., "167791_Terraforming_Mars.yaml")
-            match = re.match(r"(\d+)_(.*?)\.yaml", filename)
-            if match:
-                game_id = match.group(1)
-                file_path = os.path.join("game_data", filename)
-                
-                # Load YAML file
-                game_data = load_game_data_from_yaml(file_path)
-                if game_data:
-                    game_data_dict[game_id] = game_data
+    for filename, game_data in load_game_catalog().items():
+        # Extract game ID from filename (e.g., "167791_Terraforming_Mars.yaml")
+        match = re.match(r"(\d+)_(.*?)\.yaml", filename)
+        if match:
+            game_data_dict[match.group(1)] = game_data
     
     return game_data_dict
 
@@ -283,27 +371,31 @@ def get_yaml_game_list():
     """
     Scan YAML files in game_data folder and return list of game IDs and titles
     
+    Names come from the sidecar header index (see src/data/game_index.py),
+    so unchanged files are not parsed.
+    
     Returns:
         list: List of (game ID, filename, display name) tuples
     """
     game_list = []
     # Check if game_data folder exists
-    if not os.path.exists("game_data"):
+    if not os.path.exists(GAME_DATA_DIR):
         return game_list
+    
+    index = {entry["filename"]: entry for entry in load_game_index()}
         
     # Search for YAML files
-    for filename in os.listdir("game_data"):
+    for filename in os.listdir(GAME_DATA_DIR):
         if filename.endswith(".yaml"):
             # Extract game ID from filename (e.g., "167791_Terraforming_Mars.yaml")
             match = re.match(r"(\d+)_(.*?)\.yaml", filename)
             if match:
                 game_id = match.group(1)
-                file_path = os.path.join("game_data", filename)
                 
-                # Load game data to get language-aware display name
-                game_data = load_game_data_from_yaml(file_path)
-                if game_data:
-                    display_name = get_game_display_name(game_data)
+                # Use indexed names to get language-aware display name
+                entry = index.get(filename)
+                if entry:
+                    display_name = get_game_display_name(entry)
                     game_list.append((game_id, filename, f"{game_id} - {display_name}"))
                 else:
                     # Fallback if data can't be loaded
@@ -0,0 +1,126 @@
+"""
+Sidecar header index for the YAML files in game_data/.
+
+Keeps id, filename, name and japanese_name of every saved game in
+game_data/.index.json together with the file's mtime and size, so game lists
+(e.g. the details page selectbox) can be built from stat calls alone instead
+of parsing every YAML file. The index is updated whenever a game is saved and
+repairs itself: entries whose file changed on disk are re-read on the next load.
+"""
+
+import os
+import re
+import json
+import logging
+from src.data.yaml_io import iter_game_files, file_lock, atomic_write
+
+_logger = logging.getLogger(__name__)
+
+GAME_DATA_DIR = "game_data"
+INDEX_PATH = os.path.join(GAME_DATA_DIR, ".index.json")
+_INDEX_VERSION = 1
+
+_FILENAME_PATTERN = re.compile(r"(\d+)_(.*?)\.yaml")
+
+def _read_index():
+    """Read the index entries, returning {} if the file is missing, outdated or unreadable"""
+    try:
+        with open(INDEX_PATH, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        if isinstance(index, dict) and index.get("version") == _INDEX_VERSION:
+            return index["entries"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _logger.warning(f"Ignoring unreadable game index {INDEX_PATH}: {e}")
+    return {}
+
+def _write_index(entries):
+    """Write the index atomically (readers never see a partial file)"""
+    try:
+        with atomic_write(INDEX_PATH) as file:
+            json.dump({"version": _INDEX_VERSION, "entries": entries}, file, ensure_ascii=False)
+    except OSError as e:
+        _logger.warning(f"Could not write game index {INDEX_PATH}: {e}")
+
+def _make_entry(filename, stat, game_data):
+    """Build an index entry from a file's stat result and its game data"""
+    match = _FILENAME_PATTERN.match(filename)
+    return {
+        "id": match.group(1) if match else None,
+        "filename": filename,
+        "name": game_data.get("name"),
+        "japanese_name": game_data.get("japanese_name"),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+def record_game_file(file_path, game_data):
+    """
+    Add or refresh the index entry of a game file that was just written
+
+    Parameters:
+    file_path (str): Path of the saved YAML file
+    game_data (dict): Data written to the file
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError as e:
+        _logger.warning(f"Could not index {file_path}: {e}")
+        return
+    filename = os.path.basename(file_path)
+    with file_lock(INDEX_PATH):
+        entries = _read_index()
+        entries[filename] = _make_entry(filename, stat, game_data)
+        _write_index(entries)
+
+def load_game_index(parallel=0):
+    """
+    Return the header index of all game files
+
+    Files that are new or whose mtime / size differ from their entry are
+    parsed to refresh it; all other entries are served from the index. They
+    are parsed in this process by default, since the index is loaded from the
+    threaded Streamlit server (see load_game_catalog).
+
+    Parameters:
+    parallel (int, optional): Worker processes for parsing changed files (see iter_game_files)
+
+    Returns:
+    list: Index entry dicts (id, filename, name, japanese_name, mtime_ns, size)
+        for every readable YAML file, in directory listing order
+    """
+    if not os.path.isdir(GAME_DATA_DIR):
+        return []
+
+    cached = _read_index()
+    entries = {}
+    stale = {}
+    changed = False
+
+    with os.scandir(GAME_DATA_DIR) as it:
+        for dir_entry in it:
+            if not dir_entry.name.endswith(".yaml"):
+                continue
+            stat = dir_entry.stat()
+            entry = cached.get(dir_entry.name)
+            # Placeholder keeps directory listing order for files parsed below
+            entries[dir_entry.name] = entry
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                stale[dir_entry.path] = stat
+
+    # New or modified outside save_game_data_to_yaml: re-read those files
+    for file_path, game_data, error in iter_game_files(stale, parallel=parallel):
+        filename = os.path.basename(file_path)
+        if error:
+            _logger.warning(f"Could not index {file_path}: {error}")
+        if isinstance(game_data, dict):
+            entries[filename] = _make_entry(filename, stale[file_path], game_data)
+            changed = True
+        else:
+            del entries[filename]
+
+    if changed or len(entries) != len(cached):
+        _write_index(entries)
+
+    return list(entries.values())
@@ -0,0 +1,234 @@
+"""
+Columnar view of game data for vectorized analytics.
+
+Numeric fields (weight, rating, year, playing time, player counts and every
+numeric learning_analysis metric) are stored as float NumPy arrays with NaN for
+missing values; mechanics and categories become sparse CSR one-hot matrices
+with name <-> column vocabularies. Their CSC copies serve as inverted indexes
+(name -> rows) for filtering. Aggregations and filters over many games are then
+array operations instead of loops over nested dicts.
+
+get_game_table() returns the table for the catalogue in game_data/, rebuilt
+only when a YAML file changes. src/analysis/similarity.py also builds one for
+the games of the embedding data, row-aligned with its game_data_list.
+"""
+
+import threading
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from src.data.data_handler import game_data_signature, load_all_game_data
+
+# Top-level fields stored as numeric columns (YAML keeps most of them as strings)
+NUMERIC_FIELDS = (
+    "weight",
+    "average_rating",
+    "year_published",
+    "playing_time",
+    "publisher_min_players",
+    "publisher_max_players",
+    "publisher_min_age",
+    "community_min_age",
+)
+
+# Prefix of columns taken from learning_analysis (e.g. "learning.strategic_depth")
+LEARNING_PREFIX = "learning."
+
+def _to_float(value):
+    """Convert a YAML scalar to float, NaN if missing or not numeric"""
+    if isinstance(value, bool) or value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _link_names(game, key):
+    """Names of the mechanics / categories of a game"""
+    items = game.get(key)
+    if not isinstance(items, list):
+        return []
+    return [item["name"] for item in items if isinstance(item, dict) and item.get("name")]
+
+def _one_hot(name_lists):
+    """
+    Build a CSR one-hot matrix from per-game name lists
+
+    Returns:
+    tuple: (csr_matrix of shape (games, vocabulary), sorted vocabulary list, name -> column dict)
+    """
+    vocabulary = sorted({name for names in name_lists for name in names})
+    columns = {name: i for i, name in enumerate(vocabulary)}
+
+    indptr = np.zeros(len(name_lists) + 1, dtype=np.int64)
+    indices = []
+    for row, names in enumerate(name_lists):
+        row_columns = sorted({columns[name] for name in names})
+        indices.extend(row_columns)
+        indptr[row + 1] = indptr[row] + len(row_columns)
+
+    indices = np.asarray(indices, dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.bool_), indices, indptr),
+        shape=(len(name_lists), len(vocabulary)),
+    )
+    return matrix, vocabulary, columns
+
+class GameTable:
+    """Column-oriented copy of a list of game data dicts (row i = games[i])"""
+
+    def __init__(self, games, ids=None):
+        """
+        Parameters:
+        games (list): Game data dicts (e.g. the game_data_list of the embedding data)
+        ids (list, optional): Identifier of each row, e.g. game IDs
+        """
+        games = [game if isinstance(game, dict) else {} for game in games]
+        self.ids = list(ids) if ids is not None else list(range(len(games)))
+        self._row_of = {game_id: row for row, game_id in enumerate(self.ids)}
+
+        self.numeric = {
+            field: np.array([_to_float(game.get(field)) for game in games], dtype=np.float64)
+            for field in NUMERIC_FIELDS
+        }
+
+        # Every numeric learning_analysis metric found in any game
+        analyses = [game.get("learning_analysis") if isinstance(game.get("learning_analysis"), dict) else {}
+                    for game in games]
+        metrics = sorted({
+            key for analysis in analyses for key, value in analysis.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+        for metric in metrics:
+            self.numeric[LEARNING_PREFIX + metric] = np.array(
+                [_to_float(analysis.get(metric)) for analysis in analyses], dtype=np.float64
+            )
+
+        self.mechanics, self.mechanic_vocabulary, self.mechanic_columns = _one_hot(
+            [_link_names(game, "mechanics") for game in games]
+        )
+        self.categories, self.category_vocabulary, self.category_columns = _one_hot(
+            [_link_names(game, "categories") for game in games]
+        )
+
+        # Inverted indexes: column j lists the rows that have name j
+        self._mechanic_postings = self.mechanics.tocsc()
+        self._category_postings = self.categories.tocsc()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, game_id):
+        """Row index of a game ID (None if unknown)"""
+        return self._row_of.get(game_id)
+
+    def column(self, name):
+        """
+        Numeric column by field name
+
+        Parameters:
+        name (str): Field in NUMERIC_FIELDS, or "learning.<metric>"
+
+        Returns:
+        numpy.ndarray: float64 values, NaN where missing
+        """
+        return self.numeric[name]
+
+    @staticmethod
+    def _names(matrix, vocabulary, row):
+        return [vocabulary[col] for col in matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]]
+
+    def mechanic_names(self, row):
+        """Mechanic names of one row"""
+        return self._names(self.mechanics, self.mechanic_vocabulary, row)
+
+    def category_names(self, row):
+        """Category names of one row"""
+        return self._names(self.categories, self.category_vocabulary, row)
+
+    def _match_mask(self, postings, columns, names, match_all):
+        """Rows having any (or with match_all, every) of the names"""
+        selected = {columns.get(name, -1) for name in names}
+        if -1 in selected and match_all:
+            return np.zeros(len(self), dtype=np.bool_)
+        selected.discard(-1)
+        rows = [postings.indices[postings.indptr[col]:postings.indptr[col + 1]] for col in selected]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        if match_all:
+            return np.bincount(rows, minlength=len(self)) == len(selected)
+        mask = np.zeros(len(self), dtype=np.bool_)
+        mask[rows] = True
+        return mask
+
+    def filter_mask(self, categories=None, mechanics=None, match_all=False):
+        """
+        Boolean mask of the rows matching a category / mechanic selection
+
+        A row matches if it has any selected category and any selected mechanic
+        (or every selected one with match_all). Empty selections match all rows.
+
+        Parameters:
+        categories (list, optional): Category names
+        mechanics (list, optional): Mechanic names
+        match_all (bool): Require every selected name instead of any
+
+        Returns:
+        numpy.ndarray: bool array of length len(self)
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        if categories:
+            mask &= self._match_mask(self._category_postings, self.category_columns, categories, match_all)
+        if mechanics:
+            mask &= self._match_mask(self._mechanic_postings, self.mechanic_columns, mechanics, match_all)
+        return mask
+
+    @staticmethod
+    def _counts(matrix, vocabulary, rows):
+        if rows is not None:
+            matrix = matrix[np.asarray(rows, dtype=np.int64)]
+        totals = np.asarray(matrix.sum(axis=0, dtype=np.int64)).ravel()
+        return Counter({vocabulary[col]: int(totals[col]) for col in np.flatnonzero(totals)})
+
+    def mechanic_counts(self, rows=None):
+        """
+        Number of games using each mechanic
+
+        Parameters:
+        rows (array-like, optional): Rows to count over (all rows if omitted)
+
+        Returns:
+        Counter: Mechanic name -> number of games
+        """
+        return self._counts(self.mechanics, self.mechanic_vocabulary, rows)
+
+    def category_counts(self, rows=None):
+        """
+        Number of games in each category
+
+        Parameters:
+        rows (array-like, optional): Rows to count over (all rows if omitted)
+
+        Returns:
+        Counter: Category name -> number of games
+        """
+        return self._counts(self.categories, self.category_vocabulary, rows)
+
+_table = None
+_table_signature = None
+_table_lock = threading.Lock()
+
+def get_game_table():
+    """
+    Return the columnar table of all saved games, rebuilding it when game_data/ has changed
+
+    Returns:
+    GameTable: Table with game IDs (as used by load_all_game_data) as row ids
+    """
+    global _table, _table_signature
+    signature = game_data_signature()
+    with _table_lock:
+        if _table is None or signature != _table_signature:
+            games = load_all_game_data()
+            _table = GameTable(list(games.values()), ids=list(games.keys()))
+            _table_signature = signature
+        return _table
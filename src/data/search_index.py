@@ -0,0 +1,199 @@
+"""
+Offline search index over the games saved in game_data/.
+
+Indexes name, japanese_name and alternate_names of every saved YAML file in
+memory, so the search page can answer queries for games we already hold
+without a BGG round-trip. Supports exact, prefix, substring (including CJK)
+and fuzzy (character bigram overlap) matching.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from src.data.data_handler import game_data_signature, load_all_game_data
+
+# Minimum share of the query's character bigrams a name must contain for a fuzzy match
+FUZZY_THRESHOLD = 0.65
+
+# Scores by match kind; fuzzy matches score at most _FUZZY_WEIGHT
+_SCORE_EXACT = 1.0
+_SCORE_PREFIX = 0.9
+_SCORE_WORD_PREFIX = 0.85
+_SCORE_SUBSTRING = 0.8
+_FUZZY_WEIGHT = 0.7
+
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+def normalize_text(text):
+    """
+    Normalize a name or query for matching
+
+    Applies NFKC (full-width / half-width forms), case folding, katakana to
+    hiragana conversion and collapses punctuation and whitespace to one space.
+
+    Parameters:
+    text (str): Text to normalize
+
+    Returns:
+    str: Normalized text
+    """
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    # Katakana (U+30A1-U+30F6) -> hiragana so either script matches the other
+    text = "".join(
+        chr(ord(ch) - 0x60) if "\u30a1" <= ch <= "\u30f6" else ch
+        for ch in text
+    )
+    return _SEPARATORS.sub(" ", text).strip()
+
+def _bigrams(compact):
+    """Set of character bigrams of a string without spaces"""
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+class SearchIndex:
+    """In-memory bigram index over game names"""
+
+    def __init__(self, games):
+        """
+        Parameters:
+        games (dict): Game ID -> game data dict (as returned by load_all_game_data)
+        """
+        # One entry per searchable name: (doc index, normalized, compact, bigrams)
+        self._names = []
+        self._docs = []
+        self._postings = defaultdict(set)
+        # Single characters -> names, for 1-character queries
+        self._char_postings = defaultdict(set)
+
+        for game_id, game in games.items():
+            if not isinstance(game, dict):
+                continue
+            doc = len(self._docs)
+            self._docs.append({
+                "id": str(game_id).lstrip("0") or "0",
+                "type": game.get("type", "boardgame"),
+                "name": game.get("name"),
+                "year_published": game.get("year_published"),
+            })
+
+            names = [game.get("name"), game.get("japanese_name")]
+            names.extend(game.get("alternate_names") or [])
+            seen = set()
+            for name in names:
+                if not name:
+                    continue
+                normalized = normalize_text(name)
+                if not normalized or normalized in seen:
+                    continue
+                seen.add(normalized)
+                compact = normalized.replace(" ", "")
+                grams = _bigrams(compact)
+                entry = len(self._names)
+                self._names.append((doc, normalized, compact, grams))
+                for gram in grams:
+                    self._postings[gram].add(entry)
+                for ch in set(compact):
+                    self._char_postings[ch].add(entry)
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _match_score(query, query_compact, normalized, compact, exact):
+        """Score a name by string match kind (0 if the query is not contained in it)"""
+        if normalized == query or compact == query_compact:
+            return _SCORE_EXACT
+        if exact:
+            return 0.0
+        if normalized.startswith(query) or compact.startswith(query_compact):
+            return _SCORE_PREFIX
+        if (" " + query) in (" " + normalized):
+            return _SCORE_WORD_PREFIX
+        if query_compact in compact:
+            return _SCORE_SUBSTRING
+        return 0.0
+
+    def search(self, query, exact=False, limit=50):
+        """
+        Search saved games by name
+
+        Parameters:
+        query (str): Game name (any language, partial or misspelled)
+        exact (bool): Only return games with a name equal to the query
+        limit (int): Maximum number of results
+
+        Returns:
+        list: Search results in the same form as bgg_api.search_games
+            (id, type, name, year_published), best matches first
+        """
+        query = normalize_text(query)
+        if not query:
+            return []
+        query_compact = query.replace(" ", "")
+        query_grams = _bigrams(query_compact)
+        query_gram_count = len(query_grams)
+
+        # Count shared bigrams per name from the postings; 1-character queries
+        # have no bigrams, so names containing the character are checked instead
+        if len(query_compact) < 2:
+            shared = dict.fromkeys(self._char_postings.get(query_compact, ()), query_gram_count)
+        else:
+            shared = defaultdict(int)
+            for gram in query_grams:
+                for entry in self._postings.get(gram, ()):
+                    shared[entry] += 1
+
+        best = {}
+        for entry, count in shared.items():
+            doc, normalized, compact, grams = self._names[entry]
+            score = 0.0
+            # Only names containing every query bigram can contain the query itself
+            if count == query_gram_count:
+                score = self._match_score(query, query_compact, normalized, compact, exact)
+            if not score and not exact and len(query_compact) >= 2:
+                # Fuzzy: share of the query's bigrams found in the name, blended
+                # with the Dice coefficient so closer-length names rank first
+                containment = count / query_gram_count
+                if containment >= FUZZY_THRESHOLD:
+                    dice = 2 * count / (query_gram_count + len(grams))
+                    score = _FUZZY_WEIGHT * (containment + dice) / 2
+            if score > best.get(doc, 0.0):
+                best[doc] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], str(self._docs[item[0]]["name"])))
+        return [dict(self._docs[doc]) for doc, _ in ranked[:limit]]
+
+_index = None
+_index_signature = None
+_index_lock = threading.Lock()
+
+def get_search_index():
+    """
+    Return the search index, rebuilding it when game_data/ has changed
+
+    Returns:
+    SearchIndex: Index over all saved games
+    """
+    global _index, _index_signature
+    signature = game_data_signature()
+    with _index_lock:
+        if _index is None or signature != _index_signature:
+            _index = SearchIndex(load_all_game_data())
+            _index_signature = signature
+        return _index
+
+def search_local_games(query, exact=False, limit=50):
+    """
+    Search the games saved in game_data/ by name
+
+    Parameters:
+    query (str): Game name to search
+    exact (bool): Whether to perform exact match search
+    limit (int): Maximum number of results
+
+    Returns:
+    list: List of search results (same keys as bgg_api.search_games)
+    """
+    return get_search_index().search(query, exact=exact, limit=limit)
@@ -0,0 +1,300 @@
+"""
+Central YAML reading and writing
+Uses the libyaml-backed CSafeLoader / CSafeDumper when PyYAML was built with
+libyaml, and falls back to the pure-Python SafeLoader / SafeDumper otherwise.
+Both produce identical data and output for the files in game_data/ and config/.
+iter_game_files() parses many files at once across a process pool, and
+dump_yaml_file() writes files atomically under an advisory lock.
+"""
+
+import os
+import logging
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+
+try:
+    import fcntl
+except ImportError:
+    # Advisory locking is skipped where fcntl is unavailable (Windows)
+    fcntl = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
+_logger = logging.getLogger(__name__)
+
+# Below this many files, parsing in-process is faster than starting worker processes
+PARALLEL_MIN_FILES = 64
+
+# Lock file shared by all YAML files of a directory (see file_lock)
+LOCK_FILENAME = ".yaml.lock"
+
+# Permission bits for newly created files (mkstemp would otherwise create them 0600)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Per-thread lock depths, so file_lock is re-entrant
+_held_locks = threading.local()
+
+# Process-wide fsync batching state (see fsync_batch)
+_batch_lock = threading.Lock()
+_batch_depth = 0
+_batch_files = set()
+_batch_dirs = set()
+
+def load_yaml(stream):
+    """
+    Parse a YAML document
+
+    Parameters:
+    stream (str, bytes or file): YAML text or an open file
+
+    Returns:
+    Parsed data (dict, list or scalar)
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+def dump_yaml(data, stream=None):
+    """
+    Serialize data in the project's YAML style (block style, unicode, key order kept)
+
+    Parameters:
+    data: Data to serialize (plain dicts, lists and scalars)
+    stream (file, optional): Open file to write to
+
+    Returns:
+    str or None: YAML text if no stream is given
+    """
+    return yaml.dump(
+        data, stream, Dumper=SafeDumper,
+        default_flow_style=False, allow_unicode=True, sort_keys=False
+    )
+
+def load_yaml_file(path):
+    """
+    Parse one YAML file, capturing errors instead of raising (runs in worker processes)
+
+    Parameters:
+    path (str): YAML file path
+
+    Returns:
+    tuple: (parsed data or None, error message or None)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return load_yaml(file), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def iter_game_files(paths=None, parallel=None, directory="game_data"):
+    """
+    Parse many YAML files, fanning the work out to a process pool
+
+    Results are yielded in the order of paths as soon as they are available.
+    A file that cannot be read or parsed yields its error message instead of
+    aborting the whole run. Batches smaller than PARALLEL_MIN_FILES are parsed
+    in this process.
+
+    The pool is meant for command line tools. Callers running inside the
+    Streamlit server pass parallel=0: forking a multi-threaded process can
+    deadlock the child on locks held by other threads.
+
+    Parameters:
+    paths (iterable, optional): Files to parse (default: every *.yaml in directory, sorted)
+    parallel (int, optional): Number of worker processes (None: one per CPU, 0 or 1: no pool)
+    directory (str): Directory scanned when paths is not given
+
+    Yields:
+    tuple: (path, parsed data or None, error message or None)
+    """
+    if paths is None:
+        if not os.path.isdir(directory):
+            return
+        paths = sorted(
+            os.path.join(directory, filename)
+            for filename in os.listdir(directory) if filename.endswith(".yaml")
+        )
+    else:
+        paths = list(paths)
+
+    workers = (os.cpu_count() or 1) if parallel is None else parallel
+    workers = min(workers, len(paths))
+    executor = None
+    if workers > 1 and len(paths) >= PARALLEL_MIN_FILES:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError) as e:
+            _logger.warning(f"Process pool unavailable, parsing YAML files serially: {e}")
+
+    if executor is None:
+        for path in paths:
+            data, error = load_yaml_file(path)
+            yield path, data, error
+        return
+
+    try:
+        # Several files per task keeps inter-process overhead small
+        chunksize = max(1, len(paths) // (workers * 8))
+        for path, (data, error) in zip(paths, executor.map(load_yaml_file, paths, chunksize=chunksize)):
+            yield path, data, error
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _fsync_file(path):
+    """Flush the data of a written file to disk (a failure is logged, not raised)"""
+    try:
+        # Windows only flushes handles opened for writing
+        fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    except OSError as e:
+        _logger.warning(f"Could not open {path} to flush it: {e}")
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        _logger.warning(f"Could not flush {path}: {e}")
+    finally:
+        os.close(fd)
+
+def _fsync_directory(directory):
+    """Flush a directory entry (makes a rename durable); ignored where unsupported"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Hold an advisory exclusive lock for writing path
+
+    All files in a directory share one lock file (.yaml.lock), so Streamlit
+    sessions and the cron job do not interleave writes or read-modify-write
+    cycles. Re-entrant within a thread; a no-op where fcntl is unavailable.
+
+    Parameters:
+    path (str): File about to be written
+    """
+    lock_path = os.path.abspath(os.path.join(os.path.dirname(path) or ".", LOCK_FILENAME))
+    depths = getattr(_held_locks, "depths", None)
+    if depths is None:
+        depths = _held_locks.depths = {}
+
+    if fcntl is None or depths.get(lock_path):
+        depths[lock_path] = depths.get(lock_path, 0) + 1
+        try:
+            yield
+        finally:
+            depths[lock_path] -= 1
+        return
+
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666 & ~_UMASK)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        depths[lock_path] = 1
+        try:
+            yield
+        finally:
+            depths[lock_path] = 0
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def atomic_write(path, encoding='utf-8', binary=False):
+    """
+    Open a temporary file next to path and move it over path when the block succeeds
+
+    Readers (and a crash mid-write) see either the old or the new file, never a
+    truncated one. The temporary file gets a unique name, so concurrent writers
+    (threads or processes) never share it. The data is fsynced before the
+    rename unless an fsync_batch block is active.
+
+    Parameters:
+    path (str): Target file
+    encoding (str): Text encoding (ignored when binary)
+    binary (bool): Yield a binary file object instead of a text one
+
+    Yields:
+    file: File object to write to
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding=encoding)) as file:
+            yield file
+            file.flush()
+            if not _batch_depth:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if _batch_depth:
+        with _batch_lock:
+            _batch_files.add(os.path.abspath(path))
+            _batch_dirs.add(directory)
+    else:
+        _fsync_directory(directory)
+
+@contextlib.contextmanager
+def fsync_batch():
+    """
+    Defer the fsync of atomic writes to the end of the block
+
+    For bulk writers such as the nightly update: files are still replaced
+    atomically, but the files written in the block are fsynced, followed by
+    their directories, only when the outermost block exits. Applies to all
+    threads of the process.
+    """
+    global _batch_depth
+    with _batch_lock:
+        _batch_depth += 1
+    try:
+        yield
+    finally:
+        with _batch_lock:
+            _batch_depth -= 1
+            files, directories = (), ()
+            if _batch_depth == 0:
+                files, directories = sorted(_batch_files), set(_batch_dirs)
+                _batch_files.clear()
+                _batch_dirs.clear()
+        for path in files:
+            _fsync_file(path)
+        for directory in directories:
+            _fsync_directory(directory)
+
+def dump_yaml_file(data, path):
+    """
+    Atomically write data to a YAML file under the directory's advisory lock
+
+    Parameters:
+    data: Data to serialize
+    path (str): Target file
+    """
+    with file_lock(path):
+        with atomic_write(path) as file:
+            dump_yaml(data, file)
@@ -0,0 +1,19 @@
+"""
+Shared pytest setup.
+
+Tests run against the repository root (there is no installed package) with
+the cross-process rate limiter state and the on-disk response cache turned
+off, so nothing is written to cache/ and no test waits on another process.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, "tests", "fixtures")
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+os.environ.setdefault("BGG_RATE_LIMIT_SHARED", "0")
+os.environ.setdefault("BGG_DISK_CACHE", "0")
@@ -0,0 +1,68 @@
+"""
+AsyncBGGClient must not reserve rate limit slots far ahead of its requests.
+"""
+
+import asyncio
+import re
+import threading
+
+import pytest
+
+from src.api import http_transport, rate_limiter
+from src.api.async_bgg_client import AsyncBGGClient
+from src.api.rate_limiter import RateLimiter
+
+@pytest.fixture
+def blocked_bgg(monkeypatch):
+    """Requests block until released; counts requests and rate limit reservations"""
+    state = {"reserved": 0, "started": 0, "release": threading.Event()}
+    lock = threading.Lock()
+
+    def reserve(self, cost=1):
+        with lock:
+            state["reserved"] += 1
+        return 0.0
+
+    def get_and_parse(cls, url, parse):
+        with lock:
+            state["started"] += 1
+        state["release"].wait(timeout=30)
+        ids = re.search(r"id=([^&]+)", url).group(1).split(",")
+        return [{"id": game_id, "name": f"Game {game_id}"} for game_id in ids]
+
+    monkeypatch.setattr(RateLimiter, "reserve", reserve)
+    monkeypatch.setattr(AsyncBGGClient, "_get_and_parse", classmethod(get_and_parse))
+    http_transport.set_response_cache(None)
+    rate_limiter._memory_cache.clear()
+    try:
+        yield state
+    finally:
+        state["release"].set()
+        rate_limiter._memory_cache.clear()
+
+def test_slots_are_reserved_only_for_running_requests(blocked_bgg):
+    game_ids = [str(game_id) for game_id in range(1, 2001)]
+    client = AsyncBGGClient(max_concurrency=4, chunk_size=20)
+
+    async def run():
+        results = []
+
+        async def consume():
+            async for game_id, game in client.iter_game_details(game_ids):
+                results.append((game_id, game))
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.5)
+        # 100 chunks are pending, but only the requests holding the semaphore have a slot
+        in_flight = (blocked_bgg["reserved"], blocked_bgg["started"])
+        blocked_bgg["release"].set()
+        await consumer
+        return in_flight, results
+
+    (reserved, started), results = asyncio.run(run())
+
+    assert reserved <= 4
+    assert started <= 4
+    assert blocked_bgg["reserved"] == 100
+    assert sorted(game_id for game_id, _ in results) == sorted(game_ids)
+    assert all(game["name"] == f"Game {game_id}" for game_id, game in results)
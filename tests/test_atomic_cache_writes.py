@@ -0,0 +1,89 @@
+"""
+The game index and catalogue are rewritten atomically, also by concurrent writers.
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+
+from src.data import data_handler, game_index, yaml_io
+
+def _write_concurrently(write, count=8, rounds=20):
+    """Call write(n) from count threads at once, rounds times each"""
+    barrier = threading.Barrier(count)
+
+    def worker(n):
+        barrier.wait()
+        for _ in range(rounds):
+            write(n)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_concurrent_index_writes(tmp_path, monkeypatch, caplog):
+    index_path = tmp_path / ".index.json"
+    monkeypatch.setattr(game_index, "INDEX_PATH", str(index_path))
+    dump = json.dump
+
+    def slow_dump(obj, file, **kwargs):
+        # Keep the temporary file open long enough for the writers to overlap
+        file.write(" ")
+        time.sleep(0.002)
+        dump(obj, file, **kwargs)
+
+    monkeypatch.setattr(json, "dump", slow_dump)
+
+    _write_concurrently(lambda n: game_index._write_index({f"{n}_game.yaml": {"id": str(n)}}))
+
+    with open(index_path, encoding="utf-8") as file:
+        index = json.load(file)
+    assert len(index["entries"]) == 1
+    assert os.listdir(tmp_path) == [".index.json"]
+    assert "Could not write" not in caplog.text
+
+def test_concurrent_catalog_writes(tmp_path, monkeypatch):
+    catalog_path = tmp_path / ".catalog.pickle"
+    monkeypatch.setattr(data_handler, "CATALOG_PATH", str(catalog_path))
+
+    _write_concurrently(lambda n: data_handler._write_catalog({f"{n}_game.yaml": {"id": str(n)}}))
+
+    assert len(data_handler._read_catalog()) == 1
+    with open(catalog_path, "rb") as file:
+        assert pickle.load(file)["version"] == data_handler._CATALOG_VERSION
+    assert os.listdir(tmp_path) == [".catalog.pickle"]
+
+def test_index_keeps_file_permissions(tmp_path, monkeypatch):
+    index_path = tmp_path / ".index.json"
+    monkeypatch.setattr(game_index, "INDEX_PATH", str(index_path))
+    index_path.write_text("{}", encoding="utf-8")
+    os.chmod(index_path, 0o644)
+
+    game_index._write_index({})
+
+    assert os.stat(index_path).st_mode & 0o777 == 0o644
+
+def test_batch_fsyncs_written_files_before_directories(tmp_path, monkeypatch):
+    # The batch must not rely on os.sync (missing on Windows, flushes every file system)
+    monkeypatch.delattr(os, "sync", raising=False)
+    flushed = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (flushed.append(os.fstat(fd).st_ino), fsync(fd)))
+    monkeypatch.setattr(yaml_io, "_fsync_directory", lambda directory: flushed.append(directory))
+    (tmp_path / "sub").mkdir()
+    paths = [tmp_path / "a.yaml", tmp_path / "sub" / "b.yaml"]
+
+    with yaml_io.fsync_batch():
+        with yaml_io.fsync_batch():
+            for path in paths:
+                yaml_io.dump_yaml_file({"name": path.stem}, str(path))
+        assert flushed == []
+
+    inodes = {os.stat(path).st_ino for path in paths}
+    assert set(flushed[:2]) == inodes
+    assert set(flushed[2:]) == {str(tmp_path), str(tmp_path / "sub")}
+    assert yaml_io.load_yaml(paths[1].read_text(encoding="utf-8")) == {"name": "b"}
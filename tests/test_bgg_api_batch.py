@@ -0,0 +1,249 @@
+"""
+Batched thing fetches against a local stand-in for the BGG XML API, including
+BGG's 202 "queued, come back later" answers.
+"""
+
+import asyncio
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.api import bgg_api, http_transport, rate_limiter
+from src.api.async_bgg_client import AsyncBGGClient
+from src.api.poll_queue import PollQueue
+from src.api.response_cache import ResponseCache
+from src.api.rate_limiter import RateLimiter
+
+_ITEM = (
+    '<item type="boardgame" id="{id}">'
+    '<thumbnail>https://cf.geekdo-images.com/{id}.jpg</thumbnail>'
+    '<name type="primary" sortindex="1" value="Game {id}" />'
+    '<yearpublished value="2020" />'
+    '<minplayers value="2" /><maxplayers value="4" />'
+    '<link type="boardgamemechanic" id="2040" value="Hand Management" />'
+    '</item>'
+)
+
+class _StandInBGG(BaseHTTPRequestHandler):
+    """
+    Answers /thing?id=a,b,c with one item per ID, echoed unpadded like BGG
+
+    A request containing an ID listed in ``queued`` is answered with 202 that
+    many times (counted per URL) before it gets its 200. When ``etag`` is set,
+    200 replies carry it and a matching If-None-Match is answered with 304.
+    """
+
+    requests = []
+    queued = {}
+    seen = Counter()
+    etag = None
+    not_modified = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        handler = type(self)
+        handler.requests.append(self.path)
+        if parts.path != "/thing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        ids = parse_qs(parts.query)["id"][0].split(",")
+        handler.seen[self.path] += 1
+        if handler.seen[self.path] <= max(handler.queued.get(game_id, 0) for game_id in ids):
+            self.send_response(202)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if handler.etag and self.headers.get("If-None-Match") == handler.etag:
+            handler.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", handler.etag)
+            self.end_headers()
+            return
+        items = "".join(_ITEM.format(id=game_id.lstrip("0") or "0") for game_id in ids)
+        body = f'<?xml version="1.0" encoding="utf-8"?><items termsofuse="">{items}</items>'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if handler.etag:
+            self.send_header("ETag", handler.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def bgg_server(monkeypatch):
+    """Point bgg_api at a local server; no rate limit waits, disk cache or cached results"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInBGG)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StandInBGG.requests = []
+    _StandInBGG.queued = {}
+    _StandInBGG.seen = Counter()
+    _StandInBGG.etag = None
+    _StandInBGG.not_modified = 0
+
+    monkeypatch.setattr(bgg_api, "BGG_API_BASE", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(RateLimiter, "reserve", lambda self, cost=1: 0.0)
+    # Re-poll queued requests after milliseconds instead of seconds
+    poll_queue_init = PollQueue.__init__
+    monkeypatch.setattr(
+        PollQueue, "__init__",
+        lambda self, base_delay=2.0, max_delay=30.0, max_attempts=10: poll_queue_init(self, 0.01, 0.05, max_attempts)
+    )
+    http_transport.set_session(http_transport.create_session())
+    http_transport.set_response_cache(None)
+    rate_limiter._memory_cache.clear()
+    try:
+        yield _StandInBGG.requests
+    finally:
+        http_transport.set_session(None)
+        http_transport.set_response_cache(None)
+        rate_limiter._memory_cache.clear()
+        server.shutdown()
+        server.server_close()
+
+def _requested_ids(path):
+    return re.search(r"id=([^&]+)", path).group(1).split(",")
+
+def test_one_request_per_chunk(bgg_server):
+    game_ids = [str(game_id) for game_id in range(100, 145)]
+
+    results = bgg_api.get_game_details_many(game_ids, chunk_size=20)
+
+    assert len(bgg_server) == 3
+    assert [len(_requested_ids(path)) for path in bgg_server] == [20, 20, 5]
+    assert [game_id for path in bgg_server for game_id in _requested_ids(path)] == game_ids
+    assert all("stats=1" in path for path in bgg_server)
+    assert list(results) == game_ids
+    assert results["100"]["name"] == "Game 100"
+    assert results["144"]["mechanics"] == [{"id": "2040", "name": "Hand Management"}]
+
+def test_fills_per_id_cache(bgg_server):
+    game_ids = ["13", "822", "30549"]
+
+    results = bgg_api.get_game_details_many(game_ids)
+
+    for game_id in game_ids:
+        hit, cached = bgg_api.get_game_details.cache_lookup(game_id)
+        assert hit
+        assert cached == results[game_id]
+
+    # Single-game lookups are now served from the cache without a request
+    requests_before = len(bgg_server)
+    assert bgg_api.get_game_details("822")["name"] == "Game 822"
+    assert len(bgg_server) == requests_before
+
+    # A second batch only requests the IDs that are not cached yet
+    bgg_api.get_game_details_many(game_ids + ["174430"])
+    assert _requested_ids(bgg_server[-1]) == ["174430"]
+
+def test_zero_padded_ids_match_unpadded_items(bgg_server):
+    results = bgg_api.get_game_details_many(["0013", "000822", "13"])
+
+    assert len(bgg_server) == 1
+    assert set(results) == {"0013", "000822", "13"}
+    assert results["0013"]["id"] == "13"
+    assert results["000822"]["id"] == "822"
+    assert bgg_api.get_game_details.cache_lookup("0013") == (True, results["0013"])
+
+def _chunk_requests(requests, first_id):
+    """Positions in the request log of the chunk starting with first_id"""
+    return [position for position, path in enumerate(requests) if _requested_ids(path)[0] == first_id]
+
+def _assert_fetched_while_parked(requests, parked_first_id):
+    """Other chunks were requested between the parked chunk's first 202 and its final request"""
+    parked = _chunk_requests(requests, parked_first_id)
+    assert len(parked) == 3
+    others = [position for position in range(len(requests)) if position not in parked]
+    assert any(parked[0] < position < parked[-1] for position in others)
+
+def test_queued_chunk_is_polled_while_others_are_fetched(bgg_server):
+    game_ids = [str(game_id) for game_id in range(100, 108)]
+    _StandInBGG.queued = {"100": 2}
+
+    results = bgg_api.get_game_details_many(game_ids, chunk_size=2)
+
+    assert sorted(results) == sorted(game_ids)
+    assert results["100"]["name"] == "Game 100"
+    _assert_fetched_while_parked(bgg_server, "100")
+
+def test_async_client_polls_parked_chunk(bgg_server):
+    game_ids = [str(game_id) for game_id in range(100, 108)]
+    _StandInBGG.queued = {"100": 2}
+    client = AsyncBGGClient(max_concurrency=1, chunk_size=2)
+
+    async def collect():
+        return [item async for item in client.iter_game_details(game_ids)]
+
+    results = dict(asyncio.run(collect()))
+
+    assert sorted(results) == sorted(game_ids)
+    assert all(results[game_id]["name"] == f"Game {game_id}" for game_id in game_ids)
+    _assert_fetched_while_parked(bgg_server, "100")
+
+def test_daily_update_saves_queued_games(bgg_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    import daily_update
+    monkeypatch.setattr(daily_update, "_translate_description", None)
+    game_ids = [str(game_id) for game_id in range(100, 145)]
+    _StandInBGG.queued = {"100": 1, "140": 3}
+
+    success_count, error_count = daily_update.update_game_data(game_ids)
+
+    assert (success_count, error_count) == (len(game_ids), 0)
+    saved = sorted(path.name for path in (tmp_path / "game_data").glob("*.yaml"))
+    assert saved == sorted(f"{int(game_id):06d}_Game_{game_id}.yaml" for game_id in game_ids)
+
+def test_poll_queue_gives_up_after_max_attempts(bgg_server):
+    _StandInBGG.queued = {"100": 100}
+
+    response = bgg_api._get_response_when_ready(bgg_api._thing_url(["100"]), bgg_api._rate_limited_thing_get,
+                                                max_attempts=2)
+
+    assert response.status_code == 202
+    assert len(bgg_server) == 3
+
+def test_batch_omits_chunk_that_stays_queued(bgg_server):
+    game_ids = [str(game_id) for game_id in range(100, 104)]
+    _StandInBGG.queued = {"100": 100}
+
+    results = bgg_api.get_game_details_many(game_ids, chunk_size=2)
+
+    assert sorted(results) == ["102", "103"]
+    # First request plus one re-poll per tolerated 202
+    assert len(_chunk_requests(bgg_server, "100")) == PollQueue().max_attempts + 1
+    assert bgg_api.get_game_details.cache_lookup("100") == (False, None)
+
+def test_poll_queue_park_limit():
+    poll_queue = PollQueue(base_delay=0, max_delay=0, max_attempts=2)
+
+    assert poll_queue.park("chunk")
+    assert poll_queue.park("chunk")
+    assert not poll_queue.park("chunk")
+    # Giving up resets the count, so a later run starts over
+    assert poll_queue.park("chunk")
+
+def test_revalidating_client_asks_bgg_about_fresh_cache_entries(bgg_server, tmp_path):
+    _StandInBGG.etag = '"v1"'
+    http_transport.set_response_cache(ResponseCache(str(tmp_path / "responses.sqlite3")))
+    game_ids = [str(game_id) for game_id in range(100, 105)]
+
+    asyncio.run(AsyncBGGClient().get_game_details_many(game_ids))
+    rate_limiter._memory_cache.clear()
+    asyncio.run(AsyncBGGClient().get_game_details_many(game_ids))
+    assert len(bgg_server) == 1
+
+    results = asyncio.run(AsyncBGGClient(revalidate=True).get_game_details_many(game_ids))
+
+    assert len(bgg_server) == 2
+    assert _StandInBGG.not_modified == 1
+    assert list(results) == game_ids
+    assert results["104"]["name"] == "Game 104"
@@ -0,0 +1,86 @@
+"""
+Golden-file tests pinning the dicts produced by src/api/bgg_parser.py.
+
+Each saved response in tests/fixtures/bgg/ has the expected parser output
+stored next to it as JSON. Values and key order (which ends up in the saved
+YAML files) must both match. After an intended output change, regenerate the
+JSON files with:
+
+    python tests/test_bgg_parser.py --update
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.bgg_parser import parse_mechanics, parse_search_results, parse_thing_items
+
+BGG_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "bgg")
+
+# expected JSON file -> (parser, saved response)
+GOLDEN_CASES = {
+    "thing_single.json": (parse_thing_items, "thing_single.xml"),
+    "thing_multi.json": (parse_thing_items, "thing_multi.xml"),
+    "mechanics_single.json": (parse_mechanics, "thing_single.xml"),
+    "mechanics_multi.json": (parse_mechanics, "thing_multi.xml"),
+    "search_single.json": (parse_search_results, "search_single.xml"),
+    "search_multi.json": (parse_search_results, "search_multi.xml"),
+}
+
+def _parse(expected_name):
+    parse, response_name = GOLDEN_CASES[expected_name]
+    with open(os.path.join(BGG_FIXTURES_DIR, response_name), "rb") as file:
+        return parse(file.read())
+
+def _load_expected(expected_name):
+    with open(os.path.join(BGG_FIXTURES_DIR, expected_name), encoding="utf-8") as file:
+        return json.load(file)
+
+def _key_order(value):
+    """Nested key order of dicts (json.load keeps the file's order)"""
+    if isinstance(value, dict):
+        return [(key, _key_order(item)) for key, item in value.items()]
+    if isinstance(value, list):
+        return [_key_order(item) for item in value]
+    return None
+
+@pytest.mark.parametrize("expected_name", sorted(GOLDEN_CASES))
+def test_matches_golden_output(expected_name):
+    actual = _parse(expected_name)
+    expected = _load_expected(expected_name)
+
+    assert actual == expected
+    assert _key_order(actual) == _key_order(expected)
+
+def test_multi_item_response_keeps_item_order():
+    games = _parse("thing_multi.json")
+
+    assert [game["id"] for game in games] == ["30549", "822", "926"]
+    assert [game["type"] for game in games] == ["boardgame", "boardgame", "boardgameexpansion"]
+
+def test_single_and_multi_item_parsing_agree():
+    """An item parses the same whether it is alone or one of several in the response"""
+    with open(os.path.join(BGG_FIXTURES_DIR, "thing_multi.xml"), "rb") as file:
+        content = file.read()
+    games = parse_thing_items(content)
+
+    header, rest = content.split(b"<item ", 1)
+    items = [b"<item " + part for part in rest.split(b"<item ")]
+    items[-1] = items[-1].rsplit(b"</items>", 1)[0]
+    for item, game in zip(items, games):
+        assert parse_thing_items(header + item + b"</items>") == [game]
+
+def _update_golden_files():
+    for expected_name in sorted(GOLDEN_CASES):
+        with open(os.path.join(BGG_FIXTURES_DIR, expected_name), "w", encoding="utf-8") as file:
+            json.dump(_parse(expected_name), file, ensure_ascii=False, indent=2)
+            file.write("\n")
+        print(f"Updated {expected_name}")
+
+if __name__ == "__main__" and "--update" in sys.argv:
+    _update_golden_files()
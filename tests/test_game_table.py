@@ -0,0 +1,62 @@
+"""
+The catalogue-backed GameTable is cached and rebuilt when a game file changes.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.data import data_handler, game_table
+
+def _write_game(game_dir, game_id, weight, mechanics):
+    mechanic_lines = "".join(f"- name: {name}\n" for name in mechanics)
+    (game_dir / f"{game_id:06d}_Game_{game_id}.yaml").write_text(
+        f"name: Game {game_id}\nweight: '{weight}'\nmechanics:\n{mechanic_lines}"
+        f"learning_analysis:\n  strategic_depth: {weight}\n",
+        encoding="utf-8",
+    )
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    game_dir = tmp_path / "game_data"
+    game_dir.mkdir()
+    monkeypatch.setattr(data_handler, "GAME_DATA_DIR", str(game_dir))
+    monkeypatch.setattr(data_handler, "CATALOG_PATH", str(game_dir / ".catalog.pickle"))
+    monkeypatch.setattr(game_table, "_table", None)
+    monkeypatch.setattr(game_table, "_table_signature", None)
+    _write_game(game_dir, 13, 2.3, ["Trading", "Dice Rolling"])
+    _write_game(game_dir, 822, 1.9, ["Tile Placement"])
+    return game_dir
+
+def test_table_columns_come_from_catalogue(catalogue):
+    table = game_table.get_game_table()
+
+    assert sorted(table.ids) == ["000013", "000822"]
+    row = table.row("000013")
+    assert table.column("weight")[row] == pytest.approx(2.3)
+    assert table.column("learning.strategic_depth")[row] == pytest.approx(2.3)
+    assert table.mechanic_vocabulary == ["Dice Rolling", "Tile Placement", "Trading"]
+
+def test_table_is_cached_until_a_game_file_changes(catalogue):
+    table = game_table.get_game_table()
+    assert game_table.get_game_table() is table
+
+    path = catalogue / "000822_Game_822.yaml"
+    _write_game(catalogue, 822, 3.1, ["Tile Placement", "Area Majority / Influence"])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    rebuilt = game_table.get_game_table()
+    assert rebuilt is not table
+    assert rebuilt.column("weight")[rebuilt.row("000822")] == pytest.approx(3.1)
+    assert rebuilt.mechanic_counts()["Area Majority / Influence"] == 1
+
+def test_new_game_file_is_added(catalogue):
+    game_table.get_game_table()
+
+    _write_game(catalogue, 30549, 2.4, ["Trading"])
+
+    table = game_table.get_game_table()
+    assert len(table) == 3
+    assert np.flatnonzero(table.filter_mask(mechanics=["Trading"])).size == 2
@@ -0,0 +1,35 @@
+"""
+Tokens of the offline local-hash embeddings and the embedding provider interface.
+"""
+
+import numpy as np
+import pytest
+
+from generate_embedding_model import EmbeddingProvider, LocalHashEmbeddingProvider
+
+def test_accented_latin_words_stay_whole():
+    tokens = LocalHashEmbeddingProvider.tokenize("Café Zürich Mölkky")
+
+    assert tokens == ["café", "zürich", "mölkky", "café zürich", "zürich mölkky"]
+
+def test_kana_and_cjk_runs_become_character_bigrams():
+    words = [token for token in LocalHashEmbeddingProvider.tokenize("カタンの開拓者2 三国志 ﾎﾞｰﾄﾞ") if " " not in token]
+
+    assert words == ["カタ", "タン", "ンの", "の開", "開拓", "拓者", "2", "三国", "国志", "ﾎﾞ", "ﾞｰ", "ｰﾄ", "ﾄﾞ"]
+
+def test_similar_accented_texts_embed_close():
+    provider = LocalHashEmbeddingProvider(dimension=256)
+    vectors = provider.embed_array(["Mölkky is a Finnish throwing game", "Mölkky, the Finnish throwing game",
+                                    "Zürich tram network building"])
+
+    assert vectors.shape == (3, 256)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+def test_providers_must_implement_embed():
+    class Incomplete(EmbeddingProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert isinstance(LocalHashEmbeddingProvider(), EmbeddingProvider)
@@ -0,0 +1,146 @@
+"""
+Large catalogues are stored and loaded without a dense N×N similarity matrix,
+and SimilarityView ranks games exactly like the dense cosine similarity matrix.
+"""
+
+import glob
+import os
+import pickle
+import shutil
+import sys
+
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+import generate_embedding_model
+from src.analysis import similarity
+from src.analysis.embedding_index import IVFIndex, SimilarityView, normalize_embeddings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAME_COUNT = 12
+
+def _square_arrays(value, n):
+    """Every N×N NumPy array reachable from value (dicts, lists, tuples and object attributes)"""
+    found = []
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            if item.ndim == 2 and item.shape == (n, n):
+                found.append(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.extend(vars(item).values())
+    return found
+
+@pytest.fixture
+def build_embeddings(tmp_path, monkeypatch):
+    """Run generate_embedding_model (local-hash model) on a copy of a few saved games"""
+    game_dir = tmp_path / "game_data"
+    game_dir.mkdir()
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, "game_data", "*.yaml")))[:GAME_COUNT]:
+        shutil.copy(path, game_dir)
+    monkeypatch.chdir(tmp_path)
+    # Mechanics / categories of the copied games are already in config/
+    monkeypatch.setattr(similarity, "process_game_data_for_yaml", lambda game_data_list: None)
+
+    def build(dense_matrix_max_games, ann_index="none"):
+        output = tmp_path / f"embeddings_{dense_matrix_max_games}_{ann_index}.pkl"
+        monkeypatch.setattr(sys, "argv", [
+            "generate_embedding_model.py", "--model", "local-hash",
+            "--data_path", str(game_dir / "*.yaml"), "--output", str(output),
+            "--workers", "1", "--request_interval", "0", "--ann_index", ann_index,
+            "--dense_matrix_max_games", str(dense_matrix_max_games),
+        ])
+        generate_embedding_model.main()
+        return str(output)
+
+    return build
+
+def test_no_square_matrix_above_dense_limit(build_embeddings):
+    output = build_embeddings(GAME_COUNT - 1)
+
+    with open(output, "rb") as file:
+        saved = pickle.load(file)
+    assert saved["similarity_matrix"] is None
+    assert saved["embeddings"].shape[0] == GAME_COUNT
+    assert _square_arrays(saved, GAME_COUNT) == []
+
+    data = similarity._load_data_impl(output)
+    assert isinstance(data["similarity_matrix"], SimilarityView)
+    assert _square_arrays(data, GAME_COUNT) == []
+
+def test_square_matrix_up_to_dense_limit(build_embeddings):
+    output = build_embeddings(GAME_COUNT)
+
+    data = similarity._load_data_impl(output)
+
+    assert isinstance(data["similarity_matrix"], np.ndarray)
+    assert data["similarity_matrix"].shape == (GAME_COUNT, GAME_COUNT)
+    assert len(_square_arrays(data, GAME_COUNT)) == 1
+
+def test_ann_index_stays_reachable_next_to_dense_matrix(build_embeddings):
+    output = build_embeddings(GAME_COUNT, ann_index="ivf")
+
+    with open(output, "rb") as file:
+        saved = pickle.load(file)
+    data = similarity._load_data_impl(output)
+    source = data["similarity_matrix"]
+
+    assert saved["similarity_matrix"].shape == (GAME_COUNT, GAME_COUNT)
+    assert isinstance(source, SimilarityView)
+    assert source.ann_index is not None
+    np.testing.assert_allclose(source[3], saved["similarity_matrix"][3], atol=1e-6)
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(7).normal(size=(60, 16))
+
+def test_view_rankings_match_dense_matrix(embeddings):
+    dense = cosine_similarity(embeddings)
+    view = SimilarityView(normalize_embeddings(embeddings))
+    mask = np.arange(len(embeddings)) % 3 != 0
+
+    for index in range(len(embeddings)):
+        assert list(similarity.top_k_similar(index, view, 10)) == list(similarity.top_k_similar(index, dense, 10))
+        assert (list(similarity.top_k_similar(index, view, 10, mask=mask))
+                == list(similarity.top_k_similar(index, dense, 10, mask=mask)))
+        assert (list(similarity.get_similar_indices(index, view, 10, similarity_threshold=0.2))
+                == list(similarity.get_similar_indices(index, dense, 10, similarity_threshold=0.2)))
+
+def test_view_indexing_matches_dense_matrix(embeddings):
+    dense = cosine_similarity(embeddings)
+    view = SimilarityView(normalize_embeddings(embeddings))
+    rows, cols = [3, 0, 7], [5, 3, 11, 2]
+
+    assert view.shape == dense.shape
+    np.testing.assert_allclose(view[4], dense[4], atol=1e-6)
+    np.testing.assert_allclose(view[4][9], dense[4][9], atol=1e-6)
+    np.testing.assert_allclose(view[np.ix_(rows, cols)], dense[np.ix_(rows, cols)], atol=1e-6)
+    np.testing.assert_allclose(view.to_dense(), dense, atol=1e-6)
+
+def test_ann_results_carry_scores_without_reading_rows(embeddings, monkeypatch):
+    normalized = normalize_embeddings(embeddings)
+    view = SimilarityView(normalized, ann_index=IVFIndex.build(normalized))
+    dense = cosine_similarity(embeddings)
+
+    def no_rows(self, key):
+        raise AssertionError("similarity row materialized")
+
+    monkeypatch.setattr(SimilarityView, "__getitem__", no_rows)
+    indices, scores = similarity.get_similar_indices(
+        5, view, 10, similarity_threshold=0.1, n_probe=view.ann_index.n_lists, return_scores=True
+    )
+
+    assert len(indices) == len(scores) > 0
+    assert list(indices) == list(similarity.top_k_similar(5, dense, len(indices)))
+    np.testing.assert_allclose(scores, dense[5][indices], atol=1e-6)
+    assert np.all(scores >= 0.1)
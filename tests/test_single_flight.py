@@ -0,0 +1,89 @@
+"""
+single_flight shares results and exceptions, but not interruptions of the running call.
+"""
+
+import threading
+
+import pytest
+
+from src.api.rate_limiter import single_flight
+
+class _Interrupted(BaseException):
+    """Stands in for KeyboardInterrupt / SystemExit raised in the leading thread"""
+
+def _run_leader_and_waiter(func):
+    """Call func in a leader thread, then in a waiter thread while the leader is running"""
+    outcomes = {}
+
+    def call(name):
+        try:
+            outcomes[name] = ("result", func("catan"))
+        except BaseException as e:
+            outcomes[name] = ("raised", e)
+
+    leader = threading.Thread(target=call, args=("leader",))
+    leader.start()
+    func.started.wait(timeout=5)
+    waiter = threading.Thread(target=call, args=("waiter",))
+    waiter.start()
+    # Give the waiter time to join the running call before it finishes
+    waiter.join(timeout=0.2)
+    func.release.set()
+    leader.join(timeout=5)
+    waiter.join(timeout=5)
+    return outcomes
+
+def _blocking(outcomes_by_call):
+    """single_flight function whose n-th call blocks until released, then returns/raises outcomes_by_call[n]"""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    @single_flight
+    def lookup(name):
+        calls.append(name)
+        started.set()
+        release.wait(timeout=5)
+        outcome = outcomes_by_call[len(calls) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    lookup.calls, lookup.started, lookup.release = calls, started, release
+    return lookup
+
+def test_concurrent_calls_share_one_result():
+    lookup = _blocking(["CATAN"])
+
+    outcomes = _run_leader_and_waiter(lookup)
+
+    assert outcomes == {"leader": ("result", "CATAN"), "waiter": ("result", "CATAN")}
+    assert lookup.calls == ["catan"]
+
+def test_exceptions_are_shared_with_waiters():
+    error = ValueError("BGG unavailable")
+    lookup = _blocking([error])
+
+    outcomes = _run_leader_and_waiter(lookup)
+
+    assert outcomes["leader"] == ("raised", error)
+    assert outcomes["waiter"] == ("raised", error)
+    assert lookup.calls == ["catan"]
+
+def test_waiters_retry_after_leader_is_interrupted():
+    interrupt = _Interrupted()
+    lookup = _blocking([interrupt, "CATAN"])
+
+    outcomes = _run_leader_and_waiter(lookup)
+
+    assert outcomes["leader"] == ("raised", interrupt)
+    assert outcomes["waiter"] == ("result", "CATAN")
+    assert lookup.calls == ["catan", "catan"]
+
+def test_next_call_after_failure_runs_again():
+    lookup = _blocking([ValueError("BGG unavailable"), "CATAN"])
+    lookup.release.set()
+
+    with pytest.raises(ValueError):
+        lookup("catan")
+    assert lookup("catan") == "CATAN"
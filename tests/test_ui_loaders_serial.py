@@ -0,0 +1,44 @@
+"""
+The game loaders used by the Streamlit pages parse in-process, never in a process pool.
+"""
+
+import os
+
+import pytest
+
+from src.data import data_handler, game_index, yaml_io
+
+@pytest.fixture
+def many_game_files(tmp_path, monkeypatch):
+    """A game_data folder large enough for iter_game_files to use a pool by default"""
+    game_dir = tmp_path / "game_data"
+    game_dir.mkdir()
+    for game_id in range(1, yaml_io.PARALLEL_MIN_FILES + 11):
+        (game_dir / f"{game_id:06d}_Game_{game_id}.yaml").write_text(
+            f"id: '{game_id}'\nname: Game {game_id}\n", encoding="utf-8"
+        )
+
+    monkeypatch.setattr(data_handler, "GAME_DATA_DIR", str(game_dir))
+    monkeypatch.setattr(data_handler, "CATALOG_PATH", str(game_dir / ".catalog.pickle"))
+    monkeypatch.setattr(game_index, "GAME_DATA_DIR", str(game_dir))
+    monkeypatch.setattr(game_index, "INDEX_PATH", str(game_dir / ".index.json"))
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started from a UI loader")
+
+    monkeypatch.setattr(yaml_io, "ProcessPoolExecutor", no_pool)
+    return yaml_io.PARALLEL_MIN_FILES + 10
+
+def test_load_all_game_data_parses_serially(many_game_files):
+    games = data_handler.load_all_game_data()
+
+    assert len(games) == many_game_files
+    assert games["000001"]["name"] == "Game 1"
+
+def test_game_index_parses_serially(many_game_files):
+    entries = game_index.load_game_index()
+
+    assert len(entries) == many_game_files
+    entry = next(entry for entry in entries if entry["filename"] == "000001_Game_1.yaml")
+    assert (entry["id"], entry["name"]) == ("000001", "Game 1")
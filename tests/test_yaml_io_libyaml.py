@@ -0,0 +1,41 @@
+"""
+The libyaml-backed loader/dumper and the pure-Python ones must agree byte for byte
+on every file in game_data/ and config/, so switching between them never
+rewrites saved files.
+"""
+
+import glob
+import os
+
+import pytest
+import yaml
+
+from src.data import yaml_io
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+YAML_FILES = sorted(
+    glob.glob(os.path.join(ROOT_DIR, "game_data", "*.yaml"))
+    + glob.glob(os.path.join(ROOT_DIR, "config", "**", "*.yaml"), recursive=True)
+)
+
+pytestmark = pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML was built without libyaml")
+
+def _round_trip(monkeypatch, path, loader, dumper):
+    """Load and dump path through yaml_io with the given classes"""
+    monkeypatch.setattr(yaml_io, "SafeLoader", loader)
+    monkeypatch.setattr(yaml_io, "SafeDumper", dumper)
+    with open(path, "r", encoding="utf-8") as file:
+        data = yaml_io.load_yaml(file)
+    return data, yaml_io.dump_yaml(data).encode("utf-8")
+
+@pytest.mark.parametrize("path", YAML_FILES, ids=lambda path: os.path.relpath(path, ROOT_DIR))
+def test_c_and_python_yaml_agree(monkeypatch, path):
+    c_data, c_output = _round_trip(monkeypatch, path, yaml.CSafeLoader, yaml.CSafeDumper)
+    py_data, py_output = _round_trip(monkeypatch, path, yaml.SafeLoader, yaml.SafeDumper)
+
+    assert c_data == py_data
+    assert c_output == py_output
+
+def test_finds_yaml_files():
+    assert any(os.sep + "game_data" + os.sep in path for path in YAML_FILES)
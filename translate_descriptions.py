@@ -16,10 +16,10 @@ import argparse
 import os
 import sys
 import time
-import yaml
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
+from src.data import yaml_io
 
 load_dotenv()
 
@@ -44,7 +44,7 @@ def parse_args():
 def load_yaml(path: Path) -> dict | None:
     try:
         with open(path, encoding="utf-8") as f:
-            return yaml.safe_load(f)
+            return yaml_io.load_yaml(f)
     except Exception as e:
         logger.warning(f"Failed to load {path.name}: {e}")
         return None
@@ -52,8 +52,7 @@ def load_yaml(path: Path) -> dict | None:
 
 def save_yaml(path: Path, data: dict) -> bool:
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        yaml_io.dump_yaml_file(data, str(path))
         return True
     except Exception as e:
         logger.error(f"Failed to save {path.name}: {e}")
@@ -1,10 +1,22 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from src.data.data_handler import load_all_game_data
+from src.data.game_table import get_game_table, LEARNING_PREFIX
 from src.analysis.learning_curve import calculate_learning_curve
 from ui.ui_components import compare_games_radar_chart
 from src.utils.language import t, get_game_display_name, get_metric_names
 
+# learning_analysis metrics compared in the radar chart and the table
+COMPARE_METRICS = (
+    "initial_barrier",
+    "strategic_depth",
+    "replayability",
+    "decision_points",
+    "interaction_complexity",
+    "rules_complexity",
+)
+
 def compare_page():
     """Display the page to compare multiple games"""
     st.header(t("compare.title"))
@@ -44,14 +56,25 @@ def compare_page():
                 st.warning(t("compare.limit_warning"))
                 selected_game_ids = selected_game_ids[:6]
             
+            # Learning metrics and BGG weight of the selected games from the columnar table
+            table = get_game_table()
+            selected_game_ids = [game_id for game_id in selected_game_ids if table.row(game_id) is not None]
+            rows = np.array([table.row(game_id) for game_id in selected_game_ids], dtype=np.int64)
+            metric_values = np.full((len(rows), len(COMPARE_METRICS)), np.nan)
+            for column, metric in enumerate(COMPARE_METRICS):
+                if LEARNING_PREFIX + metric in table.numeric:
+                    metric_values[:, column] = table.column(LEARNING_PREFIX + metric)[rows]
+            weights = np.nan_to_num(table.column("weight")[rows])
+            
             # Get data and learning curve info for each game
             games_data = []
-            for game_id in selected_game_ids:
+            game_weights = []
+            for game_id, values, weight in zip(selected_game_ids, metric_values, weights):
                 game_data = all_game_data[game_id]
                 
                 # Use learning curve info if available
-                if 'learning_analysis' in game_data:
-                    learning_curve = game_data['learning_analysis']
+                if not np.isnan(values).all():
+                    learning_curve = dict(zip(COMPARE_METRICS, np.nan_to_num(values).tolist()))
                 # Otherwise calculate it
                 elif ('description' in game_data and 'mechanics' in game_data and 
                       'weight' in game_data):
@@ -62,6 +85,7 @@ def compare_page():
                     continue
                 
                 games_data.append((game_data, learning_curve))
+                game_weights.append(weight)
             
             # Display comparison radar chart
             if games_data:
@@ -74,7 +98,7 @@ def compare_page():
                 comparison_data = []
                 metric_names = get_metric_names()
                 
-                for game_data, learning_curve in games_data:
+                for (game_data, learning_curve), weight in zip(games_data, game_weights):
                     game_name = get_game_display_name(game_data)
                     comparison_data.append({
                         metric_names.get("game_name", "Game Name"): game_name,
@@ -84,7 +108,7 @@ def compare_page():
                         metric_names.get("decision_points", "Decision Points"): f"{learning_curve.get('decision_points', 0):.2f}",
                         metric_names.get("interaction_complexity", "Player Interaction"): f"{learning_curve.get('interaction_complexity', 0):.2f}",
                         metric_names.get("rules_complexity", "Rules Complexity"): f"{learning_curve.get('rules_complexity', 0):.2f}",
-                        metric_names.get("bgg_weight", "BGG Weight"): f"{float(game_data.get('weight', 0)):.2f}"
+                        metric_names.get("bgg_weight", "BGG Weight"): f"{weight:.2f}"
                     })
                 
                 comparison_df = pd.DataFrame(comparison_data)
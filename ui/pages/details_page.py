@@ -21,7 +21,7 @@ from src.analysis.category_complexity import add_missing_category
 from src.analysis.rank_complexity import add_missing_rank_type
 
 # Import language utilities
-from src.utils.language import t, get_game_display_name, format_language_caption
+from src.utils.language import t, format_language_caption
 
 def update_yaml_from_game_data(game_data):
     """
@@ -84,22 +84,10 @@ def details_page():
         game_id = st.text_input(t("details.input_placeholder"))
     else:
         if yaml_games:
-            # Create display names with language support
-            yaml_games_display = []
-            for game_info in yaml_games:
-                game_id, filename, _ = game_info
-                # Load game data to get display name
-                yaml_file_path_temp = os.path.join("game_data", filename)
-                game_data_temp = load_game_data_from_yaml(yaml_file_path_temp)
-                if game_data_temp:
-                    display_name = get_game_display_name(game_data_temp)
-                    yaml_games_display.append((game_id, filename, f"{game_id} - {display_name}"))
-                else:
-                    yaml_games_display.append(game_info)
-            
+            # Display names are already language-aware (built from the header index)
             selected_game = st.selectbox(
                 t("details.select_game"),
-                options=yaml_games_display,
+                options=yaml_games,
                 format_func=lambda x: x[2]  # Use display name
             )
             game_id = selected_game[0] if selected_game else ""
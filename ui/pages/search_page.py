@@ -1,6 +1,7 @@
 import streamlit as st
 from src.api.bgg_api import search_games
 from src.data.data_handler import search_results_to_dataframe
+from src.data.search_index import search_local_games
 from src.utils.language import t, get_game_display_name, get_dataframe_column_names
 
 def search_page():
@@ -8,19 +9,30 @@ def search_page():
     st.header(t("search.title"))
     
     # Search parameter input fields
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
         query = st.text_input(t("search.input_placeholder"))
     with col2:
         exact = st.checkbox(t("search.exact_match"), value=False)
+    with col3:
+        include_bgg = st.checkbox(t("search.include_bgg"), value=False)
     
     # Search button
     if st.button(t("search.search_button"), type="primary"):
         if query:
-            results = search_games(query, exact)
+            # Saved games are found locally; BGG is only queried as a fallback
+            results = search_local_games(query, exact)
+            local_count = len(results)
+            
+            if include_bgg or not results:
+                local_ids = {result["id"] for result in results}
+                bgg_results = search_games(query, exact) or []
+                results = results + [r for r in bgg_results if r.get("id") not in local_ids]
             
             if results:
                 st.success(t("search.results_found", count=len(results)))
+                if local_count:
+                    st.caption(t("search.local_results", count=local_count))
                 
                 # Convert to DataFrame and display
                 df = search_results_to_dataframe(results)